@@ -18,6 +18,10 @@ import re
 import glob
 import argparse
 import datetime
+import functools
+import logging
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from ruamel.yaml import YAML
 
 # Bring in module to be tested
@@ -40,12 +44,37 @@ P4D = "p4d"     # This can be overridden via command line stuff
 P4USER = "testuser"
 P4CLIENT = "test_ws"
 TEST_ROOT = '_testrun_transfer'
+CHECKPOINT_ROOT = '_testrun_checkpoints'
+# Servers use rsh ports so the only state shared between processes is the above directories.
+# Give each pytest-xdist worker (gw0, gw1...) its own so tests can be run with "pytest -n auto"
+XDIST_WORKER = os.environ.get("PYTEST_XDIST_WORKER", "")
+if XDIST_WORKER:
+    TEST_ROOT = "%s_%s" % (TEST_ROOT, XDIST_WORKER)
+    CHECKPOINT_ROOT = "%s_%s" % (CHECKPOINT_ROOT, XDIST_WORKER)
 TRANSFER_CLIENT = "transfer"
 TRANSFER_CONFIG = "transfer.yaml"
 
 TEST_COUNTER_NAME = "P4Transfer"
 INTEG_ENGINE = 3
 
+# Skip sanity checks of source server state made before running P4Transfer (set via --fast)
+FAST_TESTS = os.environ.get("P4T_FAST_TESTS", "") not in ("", "0")
+
+# Log at INFO rather than DEBUG (set via --no-debug) - also skips p4 commands only run for debug output
+NO_DEBUG_LOGGING = os.environ.get("P4T_NO_DEBUG", "") not in ("", "0")
+
+# Put server roots and workspaces on a RAM backed filesystem where available (set via --tmpfs), so
+# the journal and db writes of each submit don't wait on the disk
+TMPFS_ROOT = "/dev/shm"
+USE_TMPFS = os.environ.get("P4T_TMPFS", "") not in ("", "0")
+
+# Default file contents, pre-encoded for create_file()
+TEST_CONTENT = b"Test content"
+
+# For recovering from a failed submit - the error includes the change to resubmit
+SUBMIT_FAILED_RE = re.compile("Submit failed -- fix problems above then")
+SUBMIT_CHANGE_RE = re.compile(r"p4 submit -c (\d+)")
+
 saved_stdoutput = StringIO()
 test_logger = None
 
@@ -55,33 +84,94 @@ def onRmTreeError(function, path, exc_info):
     os.remove(path)
 
 
+def getTestBaseDir():
+    "Directory under which the test and checkpoint roots are created"
+    if USE_TMPFS and os.path.isdir(TMPFS_ROOT):
+        return os.path.join(TMPFS_ROOT, "p4transfer_test_%d" % os.getpid())
+    return os.getcwd()
+
+
 def ensureDirectory(directory):
     if not os.path.isdir(directory):
         os.makedirs(directory)
 
 
+@functools.lru_cache(maxsize=None)
 def localDirectory(root, *dirs):
-    "Create and ensure it exists"
+    "Create and ensure it exists - cached, so cleared when the test tree is removed"
     dir_path = os.path.join(root, *dirs)
     ensureDirectory(dir_path)
     return dir_path
 
 
+def insideFiles(inside, count):
+    "Returns the paths inside_file1 .. inside_file<count> in directory inside"
+    return [os.path.join(inside, "inside_file%d" % i) for i in range(1, count + 1)]
+
+
+def _write_bytes(file_name, contents, flags):
+    "Write to file with os level calls - avoiding file object overhead"
+    if python3 and not isinstance(contents, bytes):
+        contents = contents.encode()
+    fd = os.open(file_name, flags | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        while contents:
+            contents = contents[os.write(fd, contents):]
+    finally:
+        os.close(fd)
+
+
 def create_file(file_name, contents):
-    "Create file with specified contents"
+    "Create file with specified contents - str or already encoded bytes"
     ensureDirectory(os.path.dirname(file_name))
-    if python3:
-        contents = bytes(contents.encode())
-    with open(file_name, 'wb') as f:
-        f.write(contents)
+    _write_bytes(file_name, contents, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
 
 
 def append_to_file(file_name, contents):
-    "Append contents to file"
-    if python3:
-        contents = bytes(contents.encode())
-    with open(file_name, 'ab+') as f:
-        f.write(contents)
+    "Append contents (str or bytes) to file"
+    _write_bytes(file_name, contents, os.O_WRONLY | os.O_CREAT | os.O_APPEND)
+
+
+def create_files(files_contents):
+    "Create several files in parallel - list of (file_name, contents) pairs"
+    for d in set(os.path.dirname(fc[0]) for fc in files_contents):
+        ensureDirectory(d)  # Avoid racing makedirs in worker threads
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        for f in [executor.submit(create_file, *fc) for fc in files_contents]:
+            f.result()    # Re-raises any exception from the write
+
+
+class IntegedRec(namedtuple('IntegedRec', 'mark toFile fromFile startFromRev endFromRev startToRev endToRev how change')):
+    "A db.integed journal record - mark is 'pv' or 'rv', how is the numeric integration type"
+    __slots__ = ()
+
+    def __str__(self):
+        return "@%s@ 0 @db.integed@ @%s@ @%s@ %d %d %d %d %d %d\n" % self
+
+
+def patchJournalRecs(recs, patches, prefixes=None):
+    """Returns the journal records to apply as a patch. patches is a list of (compiled regex, replacement):
+    the first regex found in a record is substituted and the record changed from put (@pv@) to replace (@rv@).
+    prefixes optionally maps the start of a record (after its '@pv@ <version> ' header) to its replacement -
+    a dict lookup for patches which are strict prefixes, tried before the regexes.
+    Records not matching anything are dropped"""
+    prefixLens = sorted(set(len(k) for k in prefixes)) if prefixes else []
+
+    def patchRec(rec):
+        if prefixLens:
+            parts = rec.split(" ", 2)
+            if len(parts) == 3:
+                for plen in prefixLens:
+                    newPrefix = prefixes.get(parts[2][:plen])
+                    if newPrefix is not None:
+                        return "@rv@ %s %s%s" % (parts[1], newPrefix, parts[2][plen:])
+        for pat, repl in patches:
+            newRec, n = pat.subn(repl, rec, count=1)
+            if n:
+                return "@rv@" + newRec[4:]  # Records from dumpDBFiles() all start "@pv@"
+        return None
+
+    return [r for r in (patchRec(rec) for rec in recs) if r is not None]
 
 
 def getP4ConfigFilename():
@@ -94,7 +184,9 @@ def getP4ConfigFilename():
 
 
 class P4Server:
-    def __init__(self, root, logger, caseInsensitive=False):
+    def __init__(self, root, logger, caseInsensitive=False, checkpoint=None):
+        """Creates and initialises server. If checkpoint is specified then the server is restored
+        from it instead, which is quicker than initialising from scratch"""
         self.root = root
         self.logger = logger
         self.server_root = os.path.join(root, "server")
@@ -104,24 +196,33 @@ class P4Server:
         ensureDirectory(self.server_root)
         ensureDirectory(self.client_root)
 
-        caseFlag = ""
+        self.caseFlag = ""
         if caseInsensitive:
-            caseFlag = "-C1 "
+            self.caseFlag = "-C1 "
         self.p4d = P4D
-        self.port = "rsh:%s -r \"%s\" -L log %s -i" % (self.p4d, self.server_root, caseFlag)
+        self.port = "rsh:%s -r \"%s\" -L log %s -i" % (self.p4d, self.server_root, self.caseFlag)
         self.p4 = P4.P4()
         self.p4.port = self.port
         self.p4.user = P4USER
         self.p4.client = P4CLIENT
+        self.client_name = P4CLIENT
+        self.configured = {}    # Configurables set via configureSet()
+
+        if checkpoint:
+            self.restoreCheckpoint(checkpoint)
+            self.p4.connect()
+            # Checkpoints are taken after the initialisation below so include its configure
+            self.configured['dm.integ.engine'] = str(INTEG_ENGINE)
+            return
+
         self.p4.connect()
 
         self.p4cmd('depots')  # triggers creation of the user
-        self.p4cmd('configure', 'set', 'dm.integ.engine=%d' % INTEG_ENGINE)
+        self.configureSet('dm.integ.engine=%d' % INTEG_ENGINE)
 
         self.p4.disconnect()  # required to pick up the configure changes
         self.p4.connect()
 
-        self.client_name = P4CLIENT
         client = self.p4.fetch_client(self.client_name)
         client._root = self.client_root
         client._lineend = 'unix'
@@ -134,6 +235,16 @@ class P4Server:
     def createTransferClient(self, name, root):
         pass
 
+    def checkpoint(self, ckp_file):
+        "Write checkpoint of current server state without truncating the journal"
+        cmd = '%s -r "%s" %s-jd "%s"' % (self.p4d, self.server_root, self.caseFlag, ckp_file)
+        self.run_cmd(cmd, dir=self.server_root, get_output=False)
+
+    def restoreCheckpoint(self, ckp_file):
+        "Restore db from checkpoint - expects a freshly created server root"
+        cmd = '%s -r "%s" %s-jr "%s"' % (self.p4d, self.server_root, self.caseFlag, ckp_file)
+        self.run_cmd(cmd, dir=self.server_root, get_output=False)
+
     def run_cmd(self, cmd, dir=".", get_output=True, timeout=35, stop_on_error=True):
         "Run cmd logging input and output"
         output = ""
@@ -185,10 +296,57 @@ class P4Server:
         self.logger.debug('testp4r:', output)
         return output
 
+    def configureSet(self, setting):
+        "Runs 'configure set' for setting (name=value) unless this server already has that value"
+        name, value = setting.split("=", 1)
+        if self.configured.get(name) == value:
+            return
+        self.p4cmd('configure', 'set', setting)
+        self.configured[name] = value
+
+    def p4cmdBatch(self, cmd, files, filetype=None):
+        """Runs cmd (e.g. add/edit/delete) once for many files rather than once per file.
+        files is a list, or a dict of file: filetype in which case one command is run per filetype"""
+        if not isinstance(files, dict):
+            files = dict((f, filetype) for f in files)
+        groups = {}
+        for f, ftype in files.items():
+            groups.setdefault(ftype, []).append(f)
+        output = []
+        for ftype, flist in groups.items():
+            args = [cmd] + (['-t', ftype] if ftype else []) + flist
+            output.extend(self.p4cmd(*args))
+        return output
+
+    def addAndSubmit(self, files_contents, desc):
+        "Creates files from list of (file_name, contents) pairs, then adds them all with one command and submits"
+        for fname, contents in files_contents:
+            create_file(fname, contents)
+        self.p4cmd('add', *[fc[0] for fc in files_contents])
+        return self.p4cmd('submit', '-d', desc)
+
+    def editAndSubmit(self, files, update, desc):
+        """Opens files for edit, calls update(file_name) on each to change its contents, then submits.
+        Saves repeating the edit/change/submit sequence in tests"""
+        self.p4cmd('edit', *files)
+        for f in files:
+            update(f)
+        return self.p4cmd('submit', '-d', desc)
+
+    def editAppendSubmit(self, file_name, contents_descs):
+        "Runs an edit/append/submit cycle for each (contents, desc) pair - so one new revision per pair"
+        for contents, desc in contents_descs:
+            self.editAndSubmit([file_name], lambda f: append_to_file(f, contents), desc)
+
 
 class TestP4TransferBase(unittest.TestCase):
     """Base class for tests"""
 
+    # Checkpoints of freshly initialised servers, keyed by (name, caseInsensitive)
+    checkpoints = None
+    # Set False in a subclass whose tests need every server initialised from scratch
+    restoreCheckpoints = True
+
     def __init__(self, methodName='runTest'):
         global saved_stdoutput, test_logger
         saved_stdoutput.truncate(0)
@@ -205,11 +363,38 @@ class TestP4TransferBase(unittest.TestCase):
         else:
             return super(TestP4TransferBase, self).assertRegexpMatches(*args, **kwargs)
 
+    def assertIntegrationsHow(self, rev, expected):
+        "Checks the how of each of a filelog revision's integrations - so their number too"
+        self.assertEqual([integ.how for integ in rev.integrations], expected)
+
+    def assertRevisionActions(self, filelog, expected):
+        "Checks the actions of the latest len(expected) revisions of a filelog, newest first"
+        self.assertEqual([rev.action for rev in filelog.revisions[:len(expected)]], expected)
+
     def assertContentsEqual(self, expected, content):
         if python3:
             content = content.decode()
         self.assertEqual(expected, content)
 
+    @classmethod
+    def setUpClass(cls):
+        super(TestP4TransferBase, cls).setUpClass()
+        cls.checkpoints = {}
+        cls.checkpoint_root = os.path.join(getTestBaseDir(), CHECKPOINT_ROOT)
+        if os.path.isdir(cls.checkpoint_root):
+            shutil.rmtree(cls.checkpoint_root, False, onRmTreeError)
+        os.makedirs(cls.checkpoint_root)
+
+    @classmethod
+    def tearDownClass(cls):
+        if os.path.isdir(cls.checkpoint_root):
+            shutil.rmtree(cls.checkpoint_root, False, onRmTreeError)
+        # Unlike a directory under cwd, nothing is left in tmpfs for debugging as it holds memory
+        baseDir = getTestBaseDir()
+        if baseDir != os.getcwd() and os.path.isdir(baseDir):
+            shutil.rmtree(baseDir, False, onRmTreeError)
+        super(TestP4TransferBase, cls).tearDownClass()
+
     def setUp(self):
         self.setDirectories()
 
@@ -220,18 +405,45 @@ class TestP4TransferBase(unittest.TestCase):
         # self.cleanupTestTree()
 
     def setDirectories(self, caseInsensitive=False):
+        # getLogger() sets DEBUG when the shared logger is first created, so set the level for every test
+        self.logger.setLevel(logging.INFO if NO_DEBUG_LOGGING else logging.DEBUG)
+        # Guards debug output whose arguments are expensive to build, e.g. joined journal records
+        self.debugLogging = self.logger.isEnabledFor(logging.DEBUG)
         self.startdir = os.getcwd()
-        self.transfer_root = os.path.join(self.startdir, TEST_ROOT)
+        self.transfer_root = os.path.join(getTestBaseDir(), TEST_ROOT)
         self.cleanupTestTree()
 
         ensureDirectory(self.transfer_root)
 
-        self.source = P4Server(os.path.join(self.transfer_root, 'source'), self.logger, caseInsensitive=caseInsensitive)
-        self.target = P4Server(os.path.join(self.transfer_root, 'target'), self.logger, caseInsensitive=caseInsensitive)
+        # Servers are independent so restore (or initialise) them concurrently
+        self.source, self.target = self.onBothServers(self.createServer, ('source', caseInsensitive),
+                                                      ('target', caseInsensitive))
 
         self.transfer_client_root = localDirectory(self.transfer_root, 'transfer_client')
         self.writeP4Config()
 
+    def onBothServers(self, func, sourceArgs, targetArgs):
+        """Runs func(*sourceArgs) and func(*targetArgs) concurrently - for independent work on source
+        and target, which have separate connections. Returns (source result, target result)"""
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            srcFuture = executor.submit(func, *sourceArgs)
+            targFuture = executor.submit(func, *targetArgs)
+            return srcFuture.result(), targFuture.result()
+
+    def createServer(self, name, caseInsensitive):
+        """The first test in the class initialises the server and checkpoints it. Later tests
+        restore that checkpoint rather than repeating the initialisation. Server paths are
+        the same for every test so client specs in the checkpoint remain valid"""
+        key = (name, caseInsensitive)
+        ckp_file = self.checkpoints.get(key)
+        server = P4Server(os.path.join(self.transfer_root, name), self.logger,
+                          caseInsensitive=caseInsensitive, checkpoint=ckp_file)
+        if ckp_file is None and self.restoreCheckpoints:
+            ckp_file = os.path.join(self.checkpoint_root, "%s%s.ckp" % (name, "_ci" if caseInsensitive else ""))
+            server.checkpoint(ckp_file)
+            self.checkpoints[key] = ckp_file
+        return server
+
     def writeP4Config(self):
         "Write appropriate files - useful for occasional manual debugging"
         p4config_filename = getP4ConfigFilename()
@@ -255,6 +467,7 @@ class TestP4TransferBase(unittest.TestCase):
         os.chdir(self.startdir)
         if os.path.isdir(self.transfer_root):
             shutil.rmtree(self.transfer_root, False, onRmTreeError)
+        localDirectory.cache_clear()
 
     def getDefaultOptions(self):
         config = {}
@@ -271,6 +484,10 @@ class TestP4TransferBase(unittest.TestCase):
         config = self.getDefaultOptions()
         self.createConfigFile(options=config)
 
+    def configureServers(self, setting):
+        "Sets configurable on source and target concurrently"
+        self.onBothServers(P4Server.configureSet, (self.source, setting), (self.target, setting))
+
     def createConfigFile(self, srcOptions=None, targOptions=None, options=None):
         "Creates config file with extras if appropriate"
         if options is None:
@@ -327,10 +544,39 @@ class TestP4TransferBase(unittest.TestCase):
         self.assertEqual(sourceCounter, sourceValue, "Source counter is not {} but {}".format(sourceValue, sourceCounter))
         self.assertEqual(targetCounter, targetValue, "Target counter is not {} but {}".format(targetValue, targetCounter))
 
+    def filelogsByPath(self, server, *paths):
+        "Runs a single filelog for all paths and returns results keyed by depotFile"
+        return dict((f.depotFile, f) for f in server.p4.run_filelog(*paths))
+
+    def createStreamDepot(self, server, depotName, mainline=True):
+        "Creates a stream depot, by default containing a mainline stream //<depotName>/main"
+        d = server.p4.fetch_depot(depotName)
+        d['Type'] = 'stream'
+        server.p4.save_depot(d)
+        if mainline:
+            s = server.p4.fetch_stream('-t', 'mainline', '//%s/main' % depotName)
+            server.p4.save_stream(s)
+
+    def setupStreamDepots(self, targetMainline=True):
+        "Creates src_streams and targ_streams depots concurrently"
+        self.onBothServers(self.createStreamDepot, (self.source, 'src_streams'),
+                           (self.target, 'targ_streams', targetMainline))
+
     def applyJournalPatch(self, jnl_rec):
-        "Apply journal patch"
+        """Apply journal patch - either a string of records or an iterable of individual records,
+        which are written straight to the patch file rather than being joined first"""
         jnl_fix = os.path.join(self.source.server_root, "jnl_fix")
-        create_file(jnl_fix, jnl_rec)
+        if isinstance(jnl_rec, str):
+            jnl_rec = [jnl_rec]
+
+        def encodeRec(rec):
+            rec = str(rec)
+            if not rec.endswith("\n"):
+                rec += "\n"
+            return rec.encode() if python3 else rec
+
+        with open(jnl_fix, 'wb') as f:
+            f.writelines(encodeRec(rec) for rec in jnl_rec)
         cmd = '%s -r "%s" -jr "%s"' % (self.source.p4d, self.source.server_root, jnl_fix)
         self.logger.debug("Cmd: %s" % cmd)
         subprocess.check_output(cmd, shell=True)
@@ -386,10 +632,10 @@ class TestP4TransferCaseInsensitive(TestP4TransferBase):
         inside_file4Fixed = inside_file4.replace("#", "%23")
         outside_file1Fixed = outside_file1.replace("%", "%25")
 
-        create_file(inside_file1, 'Test content')
-        create_file(inside_file3, 'Test content')
-        create_file(inside_file4, 'Test content')
-        create_file(outside_file1, 'Test content')
+        create_file(inside_file1, TEST_CONTENT)
+        create_file(inside_file3, TEST_CONTENT)
+        create_file(inside_file4, TEST_CONTENT)
+        create_file(outside_file1, TEST_CONTENT)
         self.source.p4cmd('add', '-f', inside_file1)
         self.source.p4cmd('add', '-f', inside_file3)
         self.source.p4cmd('add', '-f', inside_file4)
@@ -421,6 +667,74 @@ class TestP4TransferCaseInsensitive(TestP4TransferBase):
         self.assertEqual(files[3]['depotFile'], '//depot/import/C%23/inside_file4')
 
 
+# Journal patches for testIntegCopyAndRename* - convert copy -> branch, which can't be done through front end
+COPY_TO_BRANCH_PATCHES = [
+    (re.compile(r"(@db\.integed@ @//depot/inside/file3@ @//depot/inside/file1@ 0 1 0 1) 4\b"), r"\1 2"),
+    (re.compile(r"(@db\.integed@ @//depot/inside/file1@ @//depot/inside/file3@ 0 1 0 1) 10\b"), r"\1 5"),
+]
+OUTSIDE_COPY_TO_BRANCH_PATCHES = [
+    (re.compile(r"(@db\.integed@ @//depot/inside/file3@ @//depot/outside/file1@ 0 1 0 1) 4\b"), r"\1 2"),
+    (re.compile(r"(@db\.integed@ @//depot/outside/file1@ @//depot/inside/file3@ 0 1 0 1) 10\b"), r"\1 5"),
+]
+# Convert move/add -> add and move/delete -> delete (rev action field)
+MOVE_ACTION_PREFIXES = {
+    "@db.rev@ @//depot/inside/file3@ 1 0 8 ": "@db.rev@ @//depot/inside/file3@ 1 0 0 ",
+    "@db.revhx@ @//depot/inside/file3@ 1 0 8 ": "@db.revhx@ @//depot/inside/file3@ 1 0 0 ",
+    "@db.rev@ @//depot/inside/file1@ 1 0 7 ": "@db.rev@ @//depot/inside/file1@ 1 0 2 ",
+    "@db.revhx@ @//depot/inside/file1@ 1 0 7 ": "@db.revhx@ @//depot/inside/file1@ 1 0 2 ",
+}
+# Convert copy from -> merge from
+OUTSIDE_COPY_TO_MERGE_PATCHES = [
+    (re.compile(r"(@db\.integed@ @//depot/inside/file3@ @//depot/outside/file5@ 1 2 0 1) 6\b"), r"\1 0"),
+    (re.compile(r"(@db\.integed@ @//depot/outside/file5@ @//depot/inside/file3@ 0 1 1 2) 10\b"), r"\1 1"),
+]
+# For testRemoteIntegs - convert add -> import (rev action field, and revcx action)
+ADD_TO_IMPORT_PREFIXES = {
+    "@db.rev@ @//depot/inside/inside_file1@ 1 0 0 ": "@db.rev@ @//depot/inside/inside_file1@ 1 0 5 ",
+    "@db.revhx@ @//depot/inside/inside_file1@ 1 0 0 ": "@db.revhx@ @//depot/inside/inside_file1@ 1 0 5 ",
+    "@db.revcx@ 1 @//depot/inside/inside_file1@ 1 0 ": "@db.revcx@ 1 @//depot/inside/inside_file1@ 1 5 ",
+}
+# For testBranchAndMoveSameTarget - 10->3: edit into->branch into, 4->2: copy from->branch from
+MOVE_COPY_TO_BRANCH_PATCHES = [
+    (re.compile(r"(@db\.integed@ @//depot/inside/inside_file2@ @//depot/inside/inside_file3@ 0 1 0 1) 10\b"), r"\1 3"),
+    (re.compile(r"(@db\.integed@ @//depot/inside/inside_file3@ @//depot/inside/inside_file2@ 0 1 0 1) 4\b"), r"\1 2"),
+]
+# For testIntegDeleteOverDelete - replace rev2 with rev3 (a delete) adjusted to chg 4 and lbrRev 1.4
+REV3_TO_REV2_PATCHES = [
+    (re.compile(r"(@db\.rev@ @//depot/inside/inside_file2@) 3 0 2 5 (.* @//depot/inside/inside_file2@) @1\.5@"),
+     r"\1 2 0 2 4 \2 @1.4@"),
+]
+# For testIntegIgnoreAndEdit - change rev action from 1 (edit) to 4 (integ)
+EDIT_TO_INTEG_PREFIXES = {
+    "@db.rev@ @//depot/inside/inside_file2@ 2 0 1 4 ": "@db.rev@ @//depot/inside/inside_file2@ 2 0 4 4 ",
+    "@db.revhx@ @//depot/inside/inside_file2@ 2 0 1 4 ": "@db.revhx@ @//depot/inside/inside_file2@ 2 0 4 4 ",
+    "@db.revcx@ 4 @//depot/inside/inside_file2@ 2 1": "@db.revcx@ 4 @//depot/inside/inside_file2@ 2 4",
+}
+
+
+class EditResolve(P4.Resolver):
+    "Resolves by writing the given content to the result file and accepting edit"
+
+    def __init__(self, content):
+        self.content = content
+
+    def resolve(self, mergeData):
+        result_path = mergeData.result_path
+        if not result_path:
+            result_path = mergeData.your_path
+        create_file(result_path, self.content)
+        return 'ae'
+
+
+class EditAcceptTheirs(P4.Resolver):
+    """
+    Required because of a special 'force' flag which is set if this is done interactively - doesn't
+    do the same as if you just resolve -at. Yuk!
+    """
+    def actionResolve(self, mergeInfo):
+        return 'at'
+
+
 class TestP4Transfer(TestP4TransferBase):
 
     def __init__(self, methodName='runTest'):
@@ -489,7 +803,7 @@ class TestP4Transfer(TestP4TransferBase):
 
         inside = localDirectory(self.source.client_root, "inside")
         inside_file1 = os.path.join(inside, "inside_file1")
-        create_file(inside_file1, 'Test content')
+        create_file(inside_file1, TEST_CONTENT)
 
         self.source.p4cmd('add', inside_file1)
         desc = 'inside_file1 added'
@@ -647,7 +961,7 @@ class TestP4Transfer(TestP4TransferBase):
         self.setupTransfer()
         inside = localDirectory(self.source.client_root, "inside")
         inside_file1 = os.path.join(inside, "inside_file1")
-        create_file(inside_file1, 'Test content')
+        create_file(inside_file1, TEST_CONTENT)
 
         self.source.p4cmd('add', inside_file1)
         desc = 'inside_file1 added'
@@ -684,7 +998,7 @@ class TestP4Transfer(TestP4TransferBase):
         self.setupTransfer()
         inside = localDirectory(self.source.client_root, "inside")
         inside_file1 = os.path.join(inside, "inside_file1")
-        create_file(inside_file1, 'Test content')
+        create_file(inside_file1, TEST_CONTENT)
 
         self.source.p4cmd('add', inside_file1)
         self.source.p4cmd('submit', '-d', 'file added')
@@ -713,7 +1027,7 @@ class TestP4Transfer(TestP4TransferBase):
         self.setupTransfer()
         inside = localDirectory(self.source.client_root, "inside")
         inside_file1 = os.path.join(inside, "inside_file1")
-        create_file(inside_file1, 'Test content')
+        create_file(inside_file1, TEST_CONTENT)
 
         self.source.p4cmd('add', inside_file1)
         self.source.p4cmd('submit', '-d', 'file added')
@@ -763,7 +1077,7 @@ class TestP4Transfer(TestP4TransferBase):
         self.setupTransfer()
         inside = localDirectory(self.source.client_root, "inside")
         inside_file1 = os.path.join(inside, "inside_file1")
-        create_file(inside_file1, 'Test content')
+        create_file(inside_file1, TEST_CONTENT)
 
         self.source.p4cmd('add', inside_file1)
         self.source.p4cmd('submit', '-d', 'file added')
@@ -817,12 +1131,10 @@ class TestP4Transfer(TestP4TransferBase):
         self.source.p4.save_depot(d)
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        inside_file3 = os.path.join(inside, "inside_file3")
-        create_file(inside_file1, 'Test content')
-        create_file(inside_file2, 'Test content')
-        create_file(inside_file3, 'Test content')
+        inside_file1, inside_file2, inside_file3 = insideFiles(inside, 3)
+        create_file(inside_file1, TEST_CONTENT)
+        create_file(inside_file2, TEST_CONTENT)
+        create_file(inside_file3, TEST_CONTENT)
         self.source.p4cmd('add', '-tbinary', inside_file1)
         self.source.p4cmd('add', inside_file2)
         self.source.p4cmd('add', '-tbinary', inside_file3)
@@ -838,12 +1150,10 @@ class TestP4Transfer(TestP4TransferBase):
 
         self.source.p4cmd('archive', '-D', 'archive', inside_file1)
         filelog = self.source.p4.run_filelog('//depot/inside/inside_file1')
-        self.assertEqual(filelog[0].revisions[0].action, 'archive')
-        self.assertEqual(filelog[0].revisions[1].action, 'archive')
+        self.assertRevisionActions(filelog[0], ['archive', 'archive'])
         self.source.p4cmd('archive', '-D', 'archive', inside_file3 + "#1")
         filelog = self.source.p4.run_filelog('//depot/inside/inside_file3')
-        self.assertEqual(filelog[0].revisions[0].action, 'edit')
-        self.assertEqual(filelog[0].revisions[1].action, 'archive')
+        self.assertRevisionActions(filelog[0], ['edit', 'archive'])
 
         self.run_P4Transfer()
         self.assertCounters(2, 2)
@@ -862,7 +1172,7 @@ class TestP4Transfer(TestP4TransferBase):
 
         inside = localDirectory(self.source.client_root, "inside")
         inside_file1 = os.path.join(inside, "inside_file1")
-        create_file(inside_file1, 'Test content')
+        create_file(inside_file1, TEST_CONTENT)
 
         self.source.p4cmd('add', inside_file1)
         self.source.p4cmd('submit', '-d', 'inside_file1 added')
@@ -896,7 +1206,7 @@ class TestP4Transfer(TestP4TransferBase):
 
         inside = localDirectory(self.source.client_root, "inside")
         inside_file1 = os.path.join(inside, "inside_file1")
-        create_file(inside_file1, 'Test content')
+        create_file(inside_file1, TEST_CONTENT)
 
         self.source.p4cmd('add', inside_file1)
         self.source.p4cmd('submit', '-d', 'inside_file1 added')
@@ -918,10 +1228,9 @@ class TestP4Transfer(TestP4TransferBase):
         self.setupTransfer()
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        create_file(inside_file1, 'Test content')
-        create_file(inside_file2, 'Test content')
+        inside_file1, inside_file2 = insideFiles(inside, 2)
+        create_file(inside_file1, TEST_CONTENT)
+        create_file(inside_file2, TEST_CONTENT)
 
         self.source.p4cmd('add', inside_file1)
         self.source.p4cmd('submit', '-d', 'inside_file1 added')
@@ -1011,7 +1320,7 @@ class TestP4Transfer(TestP4TransferBase):
         rcs_fname = fname + ",v"
         inside_file1 = os.path.join(inside, fname)
 
-        create_file(inside_file1, 'Test content')
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', '-t', 'utf16', inside_file1)
         self.source.p4cmd('submit', '-d', 'inside_file1 added')
 
@@ -1061,7 +1370,7 @@ class TestP4Transfer(TestP4TransferBase):
         rcs_fname = fname + ",v"
         inside_file1 = os.path.join(inside, fname)
 
-        create_file(inside_file1, 'Test content')
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', '-t', 'utf16', inside_file1)
         self.source.p4cmd('submit', '-d', 'file added')
 
@@ -1069,7 +1378,7 @@ class TestP4Transfer(TestP4TransferBase):
         self.source.p4cmd('submit', '-d', 'file edited')
 
         self.source.p4cmd('edit', '-t', 'binary', inside_file1)
-        append_to_file(inside_file1, "Test content")
+        append_to_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('submit', '-d', 'file added')
 
         # Now we substitute the depot file with test data
@@ -1105,7 +1414,7 @@ class TestP4Transfer(TestP4TransferBase):
         localinside_file1 = os.path.join(inside, inside_file1)
         localinside_file2 = os.path.join(inside, inside_file2)
 
-        create_file(localinside_file1, 'Test content')
+        create_file(localinside_file1, TEST_CONTENT)
         create_file(localinside_file2, 'Some Test content')
         self.source.p4cmd('add', '-f', localinside_file1)
         self.source.p4cmd('add', '-f', localinside_file2)
@@ -1136,8 +1445,8 @@ class TestP4Transfer(TestP4TransferBase):
     #     localinside_file1 = os.path.join(inside, inside_file1)
     #     localinside_file2 = os.path.join(inside, inside_file2)
     #
-    #     create_file(localinside_file1, 'Test content')
-    #     create_file(localinside_file2, 'Test content')
+    #     create_file(localinside_file1, TEST_CONTENT)
+    #     create_file(localinside_file2, TEST_CONTENT)
     #     self.source.p4cmd('add', '-f', localinside_file1)
     #     self.source.p4cmd('add', '-f', localinside_file2)
     #     self.source.p4cmd('submit', '-d', 'inside_files added')
@@ -1173,10 +1482,10 @@ class TestP4Transfer(TestP4TransferBase):
         inside_file4Fixed = inside_file4.replace("#", "%23")
         outside_file1Fixed = outside_file1.replace("%", "%25")
 
-        create_file(inside_file1, 'Test content')
-        create_file(inside_file3, 'Test content')
-        create_file(inside_file4, 'Test content')
-        create_file(outside_file1, 'Test content')
+        create_file(inside_file1, TEST_CONTENT)
+        create_file(inside_file3, TEST_CONTENT)
+        create_file(inside_file4, TEST_CONTENT)
+        create_file(outside_file1, TEST_CONTENT)
         self.source.p4cmd('add', '-f', inside_file1)
         self.source.p4cmd('add', '-f', inside_file3)
         self.source.p4cmd('add', '-f', inside_file4)
@@ -1213,7 +1522,7 @@ class TestP4Transfer(TestP4TransferBase):
 
         inside = localDirectory(self.source.client_root, "inside")
         inside_file1 = os.path.join(inside, "inside_file1")
-        create_file(inside_file1, 'Test content')
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', inside_file1)
         self.source.p4cmd('submit', '-d', "inside_file1 added")
 
@@ -1256,7 +1565,7 @@ class TestP4Transfer(TestP4TransferBase):
 
         inside = localDirectory(self.source.client_root, "inside")
         inside_file1 = os.path.join(inside, "inside_file1")
-        create_file(inside_file1, "Test content")
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', '-tbinary', inside_file1)
         self.source.p4cmd('submit', '-d', "inside_file1 added")
 
@@ -1301,7 +1610,7 @@ class TestP4Transfer(TestP4TransferBase):
 
         inside = localDirectory(self.source.client_root, "inside")
         inside_file1 = os.path.join(inside, "inside_file1")
-        create_file(inside_file1, "Test content")
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', '-tbinary', inside_file1)
         self.source.p4cmd('submit', '-d', "inside_file1 added")
 
@@ -1332,9 +1641,8 @@ class TestP4Transfer(TestP4TransferBase):
         self.target.p4.save_server(svr)
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        create_file(inside_file1, "Test content")
+        inside_file1, inside_file2 = insideFiles(inside, 2)
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', '-ttext', inside_file1)
         self.source.p4cmd('submit', '-d', "inside_file1 added")
 
@@ -1359,15 +1667,11 @@ class TestP4Transfer(TestP4TransferBase):
     def testFileTypeIntegrations(self):
         "File types are integrated appropriately"
         self.setupTransfer()
-        self.target.p4cmd("configure", "set", "dm.integ.engine=2")
-        self.source.p4cmd("configure", "set", "dm.integ.engine=2")
+        self.configureServers("dm.integ.engine=2")
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        inside_file3 = os.path.join(inside, "inside_file3")
-        inside_file4 = os.path.join(inside, "inside_file4")
-        create_file(inside_file1, "Test content")
+        inside_file1, inside_file2, inside_file3, inside_file4 = insideFiles(inside, 4)
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', '-ttext', inside_file1)
         self.source.p4cmd('submit', '-d', "inside_file1 added")
 
@@ -1647,18 +1951,17 @@ class TestP4Transfer(TestP4TransferBase):
         self.assertEqual('move/add', change['action'][0])
         self.assertEqual('move/delete', change['action'][1])
         filelog = self.target.p4.run_filelog('//depot/import/new/new_file')
-        self.assertEqual(2, len(filelog[0].revisions[0].integrations))
-        self.assertEqual("copy from", filelog[0].revisions[0].integrations[0].how)
-        self.assertEqual("moved from", filelog[0].revisions[0].integrations[1].how)
+        self.assertIntegrationsHow(filelog[0].revisions[0], ["copy from", "moved from"])
 
     def testMoveCopyIgnoreCombo(self):
         """Test for Move where the add also has a copy and an ignore"""
         self.setupTransfer()
         inside = localDirectory(self.source.client_root, "inside")
         original_file = os.path.join(inside, 'original', 'original_file')
-        renamed_file = os.path.join(inside, 'new', 'new_file')
-        file2 = os.path.join(inside, 'new', 'file2')
-        file3 = os.path.join(inside, 'new', 'file3')
+        new_dir = os.path.join(inside, 'new')
+        renamed_file = os.path.join(new_dir, 'new_file')
+        file2 = os.path.join(new_dir, 'file2')
+        file3 = os.path.join(new_dir, 'file3')
         create_file(original_file, "Some content\n")
         create_file(file2, "Other content\n")
         create_file(file3, "Some Other content\n")
@@ -1687,16 +1990,12 @@ class TestP4Transfer(TestP4TransferBase):
         self.assertEqual('move/add', change['action'][0])
         self.assertEqual('move/delete', change['action'][1])
         filelog = self.target.p4.run_filelog('//depot/import/new/new_file')
-        self.assertEqual(3, len(filelog[0].revisions[0].integrations))
-        self.assertEqual("copy from", filelog[0].revisions[0].integrations[0].how)
-        self.assertEqual("ignored", filelog[0].revisions[0].integrations[1].how)
-        self.assertEqual("moved from", filelog[0].revisions[0].integrations[2].how)
+        self.assertIntegrationsHow(filelog[0].revisions[0], ["copy from", "ignored", "moved from"])
 
     def testOldStyleMove(self):
         """Old style move - a branch and delete"""
         self.setupTransfer()
-        self.target.p4cmd("configure", "set", "dm.integ.engine=2")
-        self.source.p4cmd("configure", "set", "dm.integ.engine=2")
+        self.configureServers("dm.integ.engine=2")
         inside = localDirectory(self.source.client_root, "inside")
 
         original_file = os.path.join(inside, 'dir', 'build-tc.sh')
@@ -1976,7 +2275,7 @@ class TestP4Transfer(TestP4TransferBase):
 
         inside = localDirectory(self.source.client_root, "inside")
         inside_file1 = os.path.join(inside, "inside_file1")
-        create_file(inside_file1, "Test content")
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', inside_file1)
         self.source.p4cmd('submit', '-d', 'inside_file1 added')
 
@@ -2005,9 +2304,8 @@ class TestP4Transfer(TestP4TransferBase):
         self.setupTransfer()
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        create_file(inside_file1, "Test content")
+        inside_file1, inside_file2 = insideFiles(inside, 2)
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', '-tbinary', inside_file1)
         self.source.p4cmd('submit', '-d', 'inside_file1 added')
 
@@ -2034,10 +2332,9 @@ class TestP4Transfer(TestP4TransferBase):
         self.setupTransfer()
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
+        inside_file1, inside_file2 = insideFiles(inside, 2)
 
-        create_file(inside_file1, "Test content")
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', '-tbinary', inside_file1)
         self.source.p4cmd('submit', '-d', 'inside_file1 added')
 
@@ -2069,7 +2366,7 @@ class TestP4Transfer(TestP4TransferBase):
 
         inside = localDirectory(self.source.client_root, "inside")
         inside_file1 = os.path.join(inside, "inside_file1")
-        create_file(inside_file1, "Test content")
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', inside_file1)
         self.source.p4cmd('submit', '-d', 'inside_file1 added')
 
@@ -2212,8 +2509,7 @@ class TestP4Transfer(TestP4TransferBase):
         self.assertEqual(2, len(filelog[0].revisions))
         self.assertEqual(1, len(filelog[0].revisions[0].integrations))
         self.assertEqual(0, len(filelog[0].revisions[1].integrations))
-        self.assertEqual("integrate", filelog[0].revisions[0].action)
-        self.assertEqual("add", filelog[0].revisions[1].action)
+        self.assertRevisionActions(filelog[0], ["integrate", "add"])
 
     def testHistoricalRename(self):
         "Rename for historical start mode transfer"
@@ -2265,8 +2561,7 @@ class TestP4Transfer(TestP4TransferBase):
         self.assertEqual(0, len(filelog[0].revisions[0].integrations))
         self.assertEqual(2, len(filelog[0].revisions[1].integrations))
         # self.assertEqual(0, len(filelog[0].revisions[1].integrations))
-        self.assertEqual("move/delete", filelog[0].revisions[0].action)
-        self.assertEqual("move/add", filelog[0].revisions[1].action)
+        self.assertRevisionActions(filelog[0], ["move/delete", "move/add"])
 
         filelog = self.target.p4.run_filelog('//depot/import/file1')
         self.assertEqual(3, len(filelog[0].revisions))
@@ -2468,8 +2763,7 @@ class TestP4Transfer(TestP4TransferBase):
         filelog = self.target.p4.run_filelog('//depot/import/file2')
         self.assertEqual(2, len(filelog[0].revisions))
         self.assertEqual(1, len(filelog[0].revisions[0].integrations))
-        self.assertEqual("integrate", filelog[0].revisions[0].action)
-        self.assertEqual("add", filelog[0].revisions[1].action)
+        self.assertRevisionActions(filelog[0], ["integrate", "add"])
 
         self.logger.debug("========================================== Incremental change")
         # Now make 2 changes and integrate them one at a time.
@@ -2539,8 +2833,7 @@ class TestP4Transfer(TestP4TransferBase):
         filelog = self.target.p4.run_filelog('//depot/import/file2')
         self.assertEqual(2, len(filelog[0].revisions))
         self.assertEqual(1, len(filelog[0].revisions[0].integrations))
-        self.assertEqual("edit", filelog[0].revisions[0].action)
-        self.assertEqual("add", filelog[0].revisions[1].action)
+        self.assertRevisionActions(filelog[0], ["edit", "add"])
 
         filelog = self.target.p4.run_filelog('//depot/import/file3')
         self.assertEqual(2, len(filelog[0].revisions))
@@ -2669,16 +2962,11 @@ class TestP4Transfer(TestP4TransferBase):
         # Integrate with edit
         self.source.p4cmd('integrate', inside_file1, inside_file2)
 
-        class EditResolve(P4.Resolver):
-            def resolve(self, mergeData):
-                create_file(mergeData.result_path, """
+        self.source.p4.run_resolve(resolver=EditResolve("""
         Line 1
         Line 2 - changed
         Line 3 - edited
-        """)
-                return 'ae'
-
-        self.source.p4.run_resolve(resolver=EditResolve())
+        """))
         self.source.p4cmd('submit', '-d', "Merge with edit")
 
         sourceCounter += 2
@@ -2722,8 +3010,7 @@ class TestP4Transfer(TestP4TransferBase):
         self.assertCounters(sourceCounter, targetCounter)
 
         filelog = self.target.p4.run_filelog('//depot/import/inside_file2')
-        self.assertEqual(len(filelog[0].revisions[0].integrations), 1)
-        self.assertEqual(filelog[0].revisions[0].integrations[0].how, 'delete from')
+        self.assertIntegrationsHow(filelog[0].revisions[0], ['delete from'])
 
         # Prepare re-add
         create_file(inside_file1, content1)
@@ -2814,8 +3101,7 @@ class TestP4Transfer(TestP4TransferBase):
         self.setupTransfer()
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
+        inside_file1, inside_file2 = insideFiles(inside, 2)
 
         create_file(inside_file1, "test content\n")
         self.source.p4cmd('add', inside_file1)
@@ -2838,12 +3124,7 @@ class TestP4Transfer(TestP4TransferBase):
 
         self.source.p4cmd('integrate', inside_file1, inside_file2)
 
-        class EditResolve(P4.Resolver):
-            def resolve(self, mergeData):
-                create_file(mergeData.result_path, "different contents\n")
-                return 'ae'
-
-        self.source.p4.run_resolve(resolver=EditResolve())
+        self.source.p4.run_resolve(resolver=EditResolve("different contents\n"))
         self.source.p4cmd('integrate', '-f', inside_file1, inside_file2)
         self.source.p4.run_resolve('-ay')
         self.source.p4cmd('submit', '-d', "Merge with edit")
@@ -2856,19 +3137,16 @@ class TestP4Transfer(TestP4TransferBase):
         self.assertCounters(6, 6)
 
         filelog = self.target.p4.run_filelog('//depot/import/inside_file2')
-        self.assertEqual(1, len(filelog[0].revisions[0].integrations))
-        self.assertEqual(filelog[0].revisions[0].integrations[0].how, 'edit from')
+        self.assertIntegrationsHow(filelog[0].revisions[0], ['edit from'])
 
     def testForcedIntegrate(self):
         "Integration requiring -f"
         self.setupTransfer()
-        self.source.p4cmd("configure", "set", "dm.integ.engine=2")
-        self.target.p4cmd("configure", "set", "dm.integ.engine=2")
+        self.configureServers("dm.integ.engine=2")
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        create_file(inside_file1, "Test content")
+        inside_file1, inside_file2 = insideFiles(inside, 2)
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', inside_file1)
         self.source.p4cmd('submit', '-d', 'inside_file1 added')
 
@@ -2945,17 +3223,12 @@ class TestP4Transfer(TestP4TransferBase):
 
         self.source.p4cmd('integrate', inside_file1, inside_file2)
 
-        class EditResolve(P4.Resolver):
-            def resolve(self, mergeData):
-                create_file(mergeData.result_path, content4)
-                return 'ae'
-
-        self.source.p4.run_resolve(resolver=EditResolve())
+        self.source.p4.run_resolve(resolver=EditResolve(content4))
         self.source.p4cmd('submit', '-d', "Merge with edit")
 
-        filelog = self.source.p4.run_filelog(inside_file2)
-        self.assertEqual(len(filelog[0].revisions[0].integrations), 1)
-        self.assertEqual(filelog[0].revisions[0].integrations[0].how, 'edit from')
+        if not FAST_TESTS:
+            filelog = self.source.p4.run_filelog(inside_file2)
+            self.assertIntegrationsHow(filelog[0].revisions[0], ['edit from'])
 
         # Convert dirty merge to pretend clean merge.
         #
@@ -2966,8 +3239,10 @@ class TestP4Transfer(TestP4TransferBase):
         # Clean merge (fields 0/1)
         # @pv@ 0 @db.integed@ @//depot/inside/inside_file2@ @//depot/inside/inside_ file1@ 1 2 2 3 0 4
         # @pv@ 0 @db.integed@ @//depot/inside/inside_file1@ @//depot/inside/inside_file2@ 2 3 1 2 1 4
-        jnl_rec = "@rv@ 0 @db.integed@ @//depot/inside/inside_file2@ @//depot/inside/inside_file1@ 1 2 2 3 0 4\n" + \
-            "@rv@ 0 @db.integed@ @//depot/inside/inside_file1@ @//depot/inside/inside_file2@ 2 3 1 2 1 4\n"
+        jnl_rec = [
+            IntegedRec("rv", "//depot/inside/inside_file2", "//depot/inside/inside_file1", 1, 2, 2, 3, 0, 4),
+            IntegedRec("rv", "//depot/inside/inside_file1", "//depot/inside/inside_file2", 2, 3, 1, 2, 1, 4),
+        ]
         self.applyJournalPatch(jnl_rec)
 
         self.run_P4Transfer()
@@ -2997,9 +3272,7 @@ class TestP4Transfer(TestP4TransferBase):
         Line 2
         Line 3
         """))
-        self.source.p4cmd('add', inside_file1)
-        self.source.p4cmd('add', '-t', 'ktext', inside_file3)
-        self.source.p4cmd('add', '-t', 'ktext', inside_file5)
+        self.source.p4cmdBatch('add', {inside_file1: None, inside_file3: 'ktext', inside_file5: 'ktext'})
         self.source.p4cmd('submit', '-d', 'inside_files added')
 
         inside_file2 = os.path.join(inside, "inside_file2")
@@ -3064,14 +3337,6 @@ class TestP4Transfer(TestP4TransferBase):
         """))
         self.source.p4cmd('submit', '-d', "Changed inside_files")
 
-        class EditResolve(P4.Resolver):
-            def __init__(self, content):
-                self.content = content
-
-            def resolve(self, mergeData):
-                create_file(mergeData.result_path, self.content)
-                return 'ae'
-
         # Merge with edit - but cherry picked
         self.source.p4cmd('integrate', "%s#3,3" % inside_file1, inside_file2)
         self.source.p4.run_resolve(resolver=EditResolve(dedent("""
@@ -3093,10 +3358,10 @@ class TestP4Transfer(TestP4TransferBase):
         """)))
         self.source.p4cmd('submit', '-d', "Merge with edit")
 
-        filelog = self.source.p4.run_filelog(inside_file2)
-        self.assertEqual(len(filelog[0].revisions[0].integrations), 1)
-        self.assertEqual(filelog[0].revisions[0].integrations[0].how, 'edit from')
-        self.logger.debug("print:", self.source.p4.run_print(inside_file2))
+        if not FAST_TESTS:
+            filelog = self.source.p4.run_filelog(inside_file2)
+            self.assertIntegrationsHow(filelog[0].revisions[0], ['edit from'])
+            self.logger.debug("print:", self.source.p4.run_print(inside_file2))
 
         # Convert dirty merge to clean merge
         #
@@ -3107,31 +3372,29 @@ class TestP4Transfer(TestP4TransferBase):
         # Clean merge (fields 0/1)
         # @pv@ 0 @db.integed@ @//depot/inside/inside_file2@ @//depot/inside/inside_ file1@ 1 2 2 3 0 4
         # @pv@ 0 @db.integed@ @//depot/inside/inside_file1@ @//depot/inside/inside_file2@ 2 3 1 2 1 4
-        jnl_rec = "@rv@ 0 @db.integed@ @//depot/inside/inside_file2@ @//depot/inside/inside_file1@ 2 3 2 3 0 6\n" + \
-            "@pv@ 0 @db.integed@ @//depot/inside/inside_file1@ @//depot/inside/inside_file2@ 2 3 2 3 1 6\n" + \
-            "@rv@ 0 @db.integed@ @//depot/inside/inside_file4@ @//depot/inside/inside_file3@ 2 3 2 3 0 6\n" + \
-            "@pv@ 0 @db.integed@ @//depot/inside/inside_file3@ @//depot/inside/inside_file4@ 2 3 2 3 1 6\n" + \
-            "@rv@ 0 @db.integed@ @//depot/inside/inside_file6@ @//depot/inside/inside_file5@ 2 3 2 3 0 6\n" + \
-            "@pv@ 0 @db.integed@ @//depot/inside/inside_file5@ @//depot/inside/inside_file6@ 2 3 2 3 1 6\n"
+        jnl_rec = [
+            IntegedRec("rv", "//depot/inside/inside_file2", "//depot/inside/inside_file1", 2, 3, 2, 3, 0, 6),
+            IntegedRec("pv", "//depot/inside/inside_file1", "//depot/inside/inside_file2", 2, 3, 2, 3, 1, 6),
+            IntegedRec("rv", "//depot/inside/inside_file4", "//depot/inside/inside_file3", 2, 3, 2, 3, 0, 6),
+            IntegedRec("pv", "//depot/inside/inside_file3", "//depot/inside/inside_file4", 2, 3, 2, 3, 1, 6),
+            IntegedRec("rv", "//depot/inside/inside_file6", "//depot/inside/inside_file5", 2, 3, 2, 3, 0, 6),
+            IntegedRec("pv", "//depot/inside/inside_file5", "//depot/inside/inside_file6", 2, 3, 2, 3, 1, 6),
+        ]
         self.applyJournalPatch(jnl_rec)
 
-        filelog = self.source.p4.run_filelog(inside_file2)
-        self.assertEqual(len(filelog[0].revisions[0].integrations), 1)
-        self.assertEqual(filelog[0].revisions[0].integrations[0].how, 'merge from')
-        self.logger.debug("print:", self.source.p4.run_print(inside_file2))
+        if not FAST_TESTS:
+            filelog = self.source.p4.run_filelog(inside_file2)
+            self.assertIntegrationsHow(filelog[0].revisions[0], ['merge from'])
+            self.logger.debug("print:", self.source.p4.run_print(inside_file2))
 
         self.run_P4Transfer()
         self.assertCounters(6, 6)
         self.logger.debug("print:", self.target.p4.run_print("//depot/import/inside_file2"))
 
-        filelog = self.target.p4.run_filelog("//depot/import/inside_file2")
-        self.assertEqual(filelog[0].revisions[0].integrations[0].how, 'edit from')
-
-        filelog = self.target.p4.run_filelog("//depot/import/inside_file4")
-        self.assertEqual(filelog[0].revisions[0].integrations[0].how, 'edit from')
-
-        filelog = self.target.p4.run_filelog("//depot/import/inside_file6")
-        self.assertEqual(filelog[0].revisions[0].integrations[0].how, 'edit from')
+        filelogs = self.filelogsByPath(self.target, "//depot/import/...")
+        for f in ["inside_file2", "inside_file4", "inside_file6"]:
+            filelog = filelogs["//depot/import/%s" % f]
+            self.assertEqual(filelog.revisions[0].integrations[0].how, 'edit from')
 
         content = self.target.p4.run_print('//depot/import/inside_file4')[1]
         if python3:
@@ -3159,25 +3422,20 @@ class TestP4Transfer(TestP4TransferBase):
         self.source.p4cmd("add", inside_file1)
         self.source.p4cmd("submit", '-d', 'inside_file1 added')
 
-        filelog = self.source.p4.run_filelog(inside_file1)
-        self.assertEqual(filelog[0].revisions[0].action, 'add')
+        if not FAST_TESTS:
+            filelog = self.source.p4.run_filelog(inside_file1)
+            self.assertEqual(filelog[0].revisions[0].action, 'add')
 
         recs = self.dumpDBFiles("db.rev,db.revcx,db.revhx")
         self.logger.debug(recs)
         # '@pv@ 9 @db.rev@ @//depot/inside/inside_file1@ 1 0 0 1 1420649505 1420649505 581AB2D8...69C623BDEF83 13 0 0 @//depot/inside/inside_file1@ @1.1@ 0 ',
         # @pv@ 0 @db.revcx@ 1 @//depot/inside/inside_file1@ 1 0 ',
         # '@pv@ 9 @db.revhx@ @//depot/inside/inside_file1@ 1 0 0 1 1420649505 1420649505 581AB2D8...69C623BDEF83 13 0 0 @//depot/inside/inside_file1@ @1.1@ 0 '
-        recs[0] = recs[0].replace("@ 1 0 0 1 ", "@ 1 0 5 1 ")
-        recs[1] = recs[1].replace("@ 1 0", "@ 1 5")
-        recs[2] = recs[2].replace("@ 1 0 0 1 ", "@ 1 0 5 1 ")
-        recs[0] = recs[0].replace("@pv@", "@rv@")
-        recs[1] = recs[1].replace("@pv@", "@rv@")
-        recs[2] = recs[2].replace("@pv@", "@rv@")
-
-        self.applyJournalPatch("\n".join(recs))
+        self.applyJournalPatch(patchJournalRecs(recs, [], ADD_TO_IMPORT_PREFIXES))
 
-        filelog = self.source.p4.run_filelog(inside_file1)
-        self.assertEqual(filelog[0].revisions[0].action, 'import')
+        if not FAST_TESTS:
+            filelog = self.source.p4.run_filelog(inside_file1)
+            self.assertEqual(filelog[0].revisions[0].action, 'import')
 
         self.run_P4Transfer()
         self.assertCounters(1, 1)
@@ -3201,9 +3459,9 @@ class TestP4Transfer(TestP4TransferBase):
         append_to_file(inside_file2, "New content")
         self.source.p4cmd("submit", '-d', 'inside_file1 -> inside_file2 with edit')
 
-        filelog = self.source.p4.run_filelog(inside_file1)
-        self.assertEqual(len(filelog[0].revisions[0].integrations), 1)
-        self.assertEqual(filelog[0].revisions[0].integrations[0].how, 'add into')
+        if not FAST_TESTS:
+            filelog = self.source.p4.run_filelog(inside_file1)
+            self.assertIntegrationsHow(filelog[0].revisions[0], ['add into'])
 
         # Needs to be created via journal patch
         #
@@ -3214,16 +3472,17 @@ class TestP4Transfer(TestP4TransferBase):
         # Clean branch (fields 2/3)
         # @pv@ 0 @db.integed@ @//depot/inside/inside_file2@ @//depot/inside/inside_file1@ 0 1 0 1 2 2
         # @pv@ 0 @db.integed@ @//depot/inside/inside_file1@ @//depot/inside/inside_file2@ 0 1 0 1 3 2
-        jnl_rec = "@rv@ 0 @db.integed@ @//depot/inside/inside_file2@ @//depot/inside/inside_file1@ 0 1 0 1 2 2\n" + \
-            "@rv@ 0 @db.integed@ @//depot/inside/inside_file1@ @//depot/inside/inside_file2@ 0 1 0 1 3 2\n"
+        jnl_rec = [
+            IntegedRec("rv", "//depot/inside/inside_file2", "//depot/inside/inside_file1", 0, 1, 0, 1, 2, 2),
+            IntegedRec("rv", "//depot/inside/inside_file1", "//depot/inside/inside_file2", 0, 1, 0, 1, 3, 2),
+        ]
         self.applyJournalPatch(jnl_rec)
 
-        filelog = self.source.p4.run_filelog(inside_file1)
-        self.assertEqual(len(filelog[0].revisions[0].integrations), 1)
-        self.assertEqual(filelog[0].revisions[0].integrations[0].how, 'branch into')
-        filelog = self.source.p4.run_filelog(inside_file2)
-        self.assertEqual(len(filelog[0].revisions[0].integrations), 1)
-        self.assertEqual(filelog[0].revisions[0].integrations[0].how, 'branch from')
+        if not FAST_TESTS:
+            filelog = self.source.p4.run_filelog(inside_file1)
+            self.assertIntegrationsHow(filelog[0].revisions[0], ['branch into'])
+            filelog = self.source.p4.run_filelog(inside_file2)
+            self.assertIntegrationsHow(filelog[0].revisions[0], ['branch from'])
 
         self.run_P4Transfer()
         self.assertCounters(2, 2)
@@ -3250,49 +3509,44 @@ class TestP4Transfer(TestP4TransferBase):
         self.run_P4Transfer()
         self.assertCounters(3, 3)
 
-        filelog1 = self.target.p4.run_filelog('//depot/import/inside_file1')
-        filelog2 = self.target.p4.run_filelog('//depot/import/inside_file2')
-        filelog3 = self.target.p4.run_filelog('//depot/import/file3')
+        # One filelog for all files rather than one per file
+        filelogs = self.filelogsByPath(self.target, '//depot/import/...')
+        filelog1 = filelogs['//depot/import/inside_file1']
+        filelog2 = filelogs['//depot/import/inside_file2']
+        filelog3 = filelogs['//depot/import/file3']
         self.logger.debug(filelog1)
         self.logger.debug(filelog2)
         self.logger.debug(filelog3)
 
-        self.assertEqual(len(filelog1[0].revisions), 1)
-        self.assertEqual(len(filelog2[0].revisions), 1)
-        self.assertEqual(len(filelog3[0].revisions), 1)
+        self.assertEqual(len(filelog1.revisions), 1)
+        self.assertEqual(len(filelog2.revisions), 1)
+        self.assertEqual(len(filelog3.revisions), 1)
 
-        self.assertEqual(len(filelog1[0].revisions[0].integrations), 1)
-        self.assertEqual(len(filelog2[0].revisions[0].integrations), 2)
-        self.assertEqual(len(filelog3[0].revisions[0].integrations), 1)
+        self.assertEqual(len(filelog1.revisions[0].integrations), 1)
+        self.assertEqual(len(filelog2.revisions[0].integrations), 2)
+        self.assertEqual(len(filelog3.revisions[0].integrations), 1)
 
-        self.assertEqual(filelog1[0].revisions[0].integrations[0].how, 'branch into')
-        self.assertEqual(filelog2[0].revisions[0].integrations[0].how, 'branch into')
-        self.assertEqual(filelog2[0].revisions[0].integrations[1].how, 'branch from')
-        self.assertEqual(filelog3[0].revisions[0].integrations[0].how, 'branch from')
+        self.assertEqual(filelog1.revisions[0].integrations[0].how, 'branch into')
+        self.assertEqual(filelog2.revisions[0].integrations[0].how, 'branch into')
+        self.assertEqual(filelog2.revisions[0].integrations[1].how, 'branch from')
+        self.assertEqual(filelog3.revisions[0].integrations[0].how, 'branch from')
 
     def testMultipleIntegrates(self):
         """Test for more than one integration into same target revision"""
         self.setupTransfer()
-        self.target.p4cmd("configure", "set", "dm.integ.engine=2")
-        self.source.p4cmd("configure", "set", "dm.integ.engine=2")
+        self.configureServers("dm.integ.engine=2")
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        create_file(inside_file1, "Test content")
+        inside_file1, inside_file2 = insideFiles(inside, 2)
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', inside_file1)
         self.source.p4cmd('submit', '-d', 'inside_file1 added')
 
         self.source.p4cmd('integrate', inside_file1, inside_file2)
         self.source.p4cmd('submit', '-d', 'inside_file2 added')
 
-        self.source.p4cmd('edit', inside_file1)
-        append_to_file(inside_file1, "more stuff")
-        self.source.p4cmd('submit', '-d', 'inside_file1 edited')
-
-        self.source.p4cmd('edit', inside_file1)
-        append_to_file(inside_file1, "\nyet more stuff")
-        self.source.p4cmd('submit', '-d', 'inside_file1 edited again')
+        self.source.editAndSubmit([inside_file1], lambda f: append_to_file(f, "more stuff"), 'inside_file1 edited')
+        self.source.editAndSubmit([inside_file1], lambda f: append_to_file(f, "\nyet more stuff"), 'inside_file1 edited again')
 
         self.source.p4cmd('integrate', "%s#2" % inside_file1, inside_file2)
         self.source.p4cmd('resolve', '-as')
@@ -3307,9 +3561,7 @@ class TestP4Transfer(TestP4TransferBase):
 
         filelog = self.target.p4.run_filelog('//depot/import/inside_file2')[0]
         self.logger.debug(filelog)
-        self.assertEqual(len(filelog.revisions[0].integrations), 2)
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "ignored")
-        self.assertEqual(filelog.revisions[0].integrations[1].how, "copy from")
+        self.assertIntegrationsHow(filelog.revisions[0], ["ignored", "copy from"])
 
     def testIgnoreFiles(self):
         "Test when specifying files to ignore"
@@ -3322,8 +3574,8 @@ class TestP4Transfer(TestP4TransferBase):
         inside = localDirectory(self.source.client_root, "inside")
         file1 = os.path.join(inside, 'file1')
         file2 = os.path.join(inside, 'file2')
-        create_file(file1, "Test content")
-        create_file(file2, "Test content")
+        create_file(file1, TEST_CONTENT)
+        create_file(file2, TEST_CONTENT)
         self.source.p4cmd('add', file1, file2)
         self.source.p4cmd('submit', '-d', "Added files")
 
@@ -3352,8 +3604,8 @@ class TestP4Transfer(TestP4TransferBase):
 
         file1 = os.path.join(inside, 'file1')
         file2 = os.path.join(subdir, 'file2')
-        create_file(file1, "Test content")
-        create_file(file2, "Test content")
+        create_file(file1, TEST_CONTENT)
+        create_file(file2, TEST_CONTENT)
         self.source.p4cmd('add', file1, file2)
         self.source.p4cmd('submit', '-d', "Added files")
 
@@ -3475,9 +3727,9 @@ class TestP4Transfer(TestP4TransferBase):
         append_to_file(inside_file, "extra stuff")
         self.source.p4cmd('submit', '-d', "Integrated from outside to inside")
 
-        filelog = self.source.p4.run_filelog(outside_file)
-        self.assertEqual(len(filelog[0].revisions[0].integrations), 1)
-        self.assertEqual(filelog[0].revisions[0].integrations[0].how, 'add into')
+        if not FAST_TESTS:
+            filelog = self.source.p4.run_filelog(outside_file)
+            self.assertIntegrationsHow(filelog[0].revisions[0], ['add into'])
 
         # Branch as edit (fields 2/11)
         # @pv@ 0 @db.integed@ @//depot/inside/inside_file@ @//depot/outside/outside_file@ 0 1 2 3 2 4
@@ -3486,13 +3738,15 @@ class TestP4Transfer(TestP4TransferBase):
         # Clean branch (fields 2/3)
         # @pv@ 0 @db.integed@ @//depot/inside/inside_file@ @//depot/outside/outside_file@ 0 1 2 3 2 4
         # @pv@ 0 @db.integed@ @//depot/outside/outside_file@ @//depot/inside/inside_file@ 2 3 0 1 3 4
-        jnl_rec = "@rv@ 0 @db.integed@ @//depot/inside/inside_file@ @//depot/outside/outside_file@ 0 1 2 3 2 4\n" + \
-            "@rv@ 0 @db.integed@ @//depot/outside/outside_file@ @//depot/inside/inside_file@ 2 3 0 1 3 4\n"
+        jnl_rec = [
+            IntegedRec("rv", "//depot/inside/inside_file", "//depot/outside/outside_file", 0, 1, 2, 3, 2, 4),
+            IntegedRec("rv", "//depot/outside/outside_file", "//depot/inside/inside_file", 2, 3, 0, 1, 3, 4),
+        ]
         self.applyJournalPatch(jnl_rec)
 
-        filelog = self.source.p4.run_filelog(inside_file)
-        self.assertEqual(len(filelog[0].revisions[0].integrations), 1)
-        self.assertEqual(filelog[0].revisions[0].integrations[0].how, 'branch from')
+        if not FAST_TESTS:
+            filelog = self.source.p4.run_filelog(inside_file)
+            self.assertIntegrationsHow(filelog[0].revisions[0], ['branch from'])
 
         self.run_P4Transfer()
         self.assertCounters(4, 3)
@@ -3584,7 +3838,8 @@ class TestP4Transfer(TestP4TransferBase):
         inside_file2 = os.path.join(inside, 'inside_file2')
         self.source.p4cmd('integrate', hidden_file, inside_file2)
         self.source.p4cmd('submit', '-d', "Copied outside_file -> inside_file2")
-        self.logger.debug(self.source.p4.run_print(inside_file2))
+        if self.debugLogging:
+            self.logger.debug(self.source.p4.run_print(inside_file2))
 
         self.source.p4.user = P4USER
         self.run_P4Transfer()
@@ -3598,13 +3853,11 @@ class TestP4Transfer(TestP4TransferBase):
     def testIntegDt(self):
         """Test for integ -Dt being required - only necessary with older integ.engine"""
         self.setupTransfer()
-        self.target.p4cmd("configure", "set", "dm.integ.engine=2")
-        self.source.p4cmd("configure", "set", "dm.integ.engine=2")
+        self.configureServers("dm.integ.engine=2")
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        create_file(inside_file1, "Test content")
+        inside_file1, inside_file2 = insideFiles(inside, 2)
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', inside_file1)
         self.source.p4cmd('submit', '-d', 'inside_file1 added')
 
@@ -3632,9 +3885,8 @@ class TestP4Transfer(TestP4TransferBase):
         self.setupTransfer()
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        create_file(inside_file1, "Test content")
+        inside_file1, inside_file2 = insideFiles(inside, 2)
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', inside_file1)
         self.source.p4cmd('submit', '-d', 'file added')
 
@@ -3660,39 +3912,26 @@ class TestP4Transfer(TestP4TransferBase):
 
         filelog = self.source.p4.run_filelog('//depot/inside/inside_file2')[0]
         self.logger.debug(filelog)
-        self.assertEqual(len(filelog.revisions[0].integrations), 1)
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "delete from")
+        self.assertIntegrationsHow(filelog.revisions[0], ["delete from"])
 
     def testIntegMultipleToOne(self):
         """Test for integrating multiple versions into single target."""
         self.setupTransfer()
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        inside_file3 = os.path.join(inside, "inside_file3")
-        create_file(inside_file1, "Test content")
+        inside_file1, inside_file2, inside_file3 = insideFiles(inside, 3)
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', inside_file1)
         self.source.p4cmd('submit', '-d', 'inside_file1 added')
 
-        self.source.p4cmd('edit', inside_file1)
-        append_to_file(inside_file1, "\nmore stuff")
-        self.source.p4cmd('submit', '-d', 'inside_file1 edited')
-
-        self.source.p4cmd('edit', inside_file1)
-        append_to_file(inside_file1, "\nYet more stuff")
-        self.source.p4cmd('submit', '-d', 'file edited again')
-
-        class EditResolve(P4.Resolver):
-            def resolve(self, mergeData):
-                create_file(mergeData.result_path, "new contents\nsome more")
-                return 'ae'
+        self.source.editAppendSubmit(inside_file1, [("\nmore stuff", 'inside_file1 edited'),
+                                                    ("\nYet more stuff", 'file edited again')])
 
         self.source.p4cmd('integrate', "%s#1" % inside_file1, inside_file2)
         self.source.p4cmd('add', inside_file2)
         self.source.p4cmd('integrate', "%s#2,2" % inside_file1, inside_file2)
         self.source.p4cmd('edit', inside_file2)
-        self.source.p4.run_resolve(resolver=EditResolve())
+        self.source.p4.run_resolve(resolver=EditResolve("new contents\nsome more"))
         self.source.p4cmd('submit', '-d', 'inside_file2 added with multiple integrates')
 
         # Separate test - 3 into 1
@@ -3706,26 +3945,18 @@ class TestP4Transfer(TestP4TransferBase):
 
         filelog = self.source.p4.run_filelog('//depot/inside/inside_file3')[0]
         self.logger.debug(filelog)
-        self.assertEqual(len(filelog.revisions[0].integrations), 3)
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "copy from")
-        self.assertEqual(filelog.revisions[0].integrations[1].how, "merge from")
-        self.assertEqual(filelog.revisions[0].integrations[2].how, "add from")
+        self.assertIntegrationsHow(filelog.revisions[0], ["copy from", "merge from", "add from"])
 
         self.run_P4Transfer()
         self.assertCounters(5, 5)
 
         filelog = self.target.p4.run_filelog('//depot/import/inside_file2')[0]
         self.logger.debug(filelog)
-        self.assertEqual(len(filelog.revisions[0].integrations), 2)
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "edit from")
-        self.assertEqual(filelog.revisions[0].integrations[1].how, "add from")
+        self.assertIntegrationsHow(filelog.revisions[0], ["edit from", "add from"])
 
         filelog = self.target.p4.run_filelog('//depot/import/inside_file3')[0]
         self.logger.debug(filelog)
-        self.assertEqual(len(filelog.revisions[0].integrations), 3)
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "copy from")
-        self.assertEqual(filelog.revisions[0].integrations[1].how, "ignored")
-        self.assertEqual(filelog.revisions[0].integrations[2].how, "ignored")
+        self.assertIntegrationsHow(filelog.revisions[0], ["copy from", "ignored", "ignored"])
 
     # Only works for p4d.21.1 or later
     def testIntegAndRenamePrevious(self):
@@ -3763,11 +3994,12 @@ class TestP4Transfer(TestP4TransferBase):
         # copy A... B...
 
         inside = localDirectory(self.source.client_root, "inside")
-        mfile1 = os.path.join(inside, "main", "file1")
-        mfile2 = os.path.join(inside, "main", "file2")
+        main_dir = os.path.join(inside, "main")
+        mfile1 = os.path.join(main_dir, "file1")
+        mfile2 = os.path.join(main_dir, "file2")
         rfile1 = os.path.join(inside, "rel", "file1")
 
-        create_file(mfile1, "Test content")
+        create_file(mfile1, TEST_CONTENT)
         self.source.p4cmd('add', mfile1)
         self.source.p4cmd('submit', '-d', 'mfile1 added')
 
@@ -3788,11 +4020,8 @@ class TestP4Transfer(TestP4TransferBase):
         filelogs = self.source.p4.run_filelog("@=5")
         self.logger.debug(filelogs)
         self.assertEqual(3, len(filelogs))
-        self.assertEqual(1, len(filelogs[0].revisions[0].integrations))
-        self.assertEqual("branch from", filelogs[0].revisions[0].integrations[0].how)
-        self.assertEqual(2, len(filelogs[1].revisions[0].integrations))
-        self.assertEqual("copy from", filelogs[1].revisions[0].integrations[0].how)
-        self.assertEqual("moved from", filelogs[1].revisions[0].integrations[1].how)
+        self.assertIntegrationsHow(filelogs[0].revisions[0], ["branch from"])
+        self.assertIntegrationsHow(filelogs[1].revisions[0], ["copy from", "moved from"])
 
         self.run_P4Transfer()
         self.assertCounters(5, 5)
@@ -3800,11 +4029,8 @@ class TestP4Transfer(TestP4TransferBase):
         filelogs = self.target.p4.run_filelog("@=5")
         self.logger.debug(filelogs)
         self.assertEqual(3, len(filelogs))
-        self.assertEqual(1, len(filelogs[0].revisions[0].integrations))
-        self.assertEqual("branch from", filelogs[0].revisions[0].integrations[0].how)
-        self.assertEqual(2, len(filelogs[1].revisions[0].integrations))
-        self.assertEqual("copy from", filelogs[1].revisions[0].integrations[0].how)
-        self.assertEqual("moved from", filelogs[1].revisions[0].integrations[1].how)
+        self.assertIntegrationsHow(filelogs[0].revisions[0], ["branch from"])
+        self.assertIntegrationsHow(filelogs[1].revisions[0], ["copy from", "moved from"])
 
     def testIntegCopyAndRename(self):
         """Test for integrating a copy and move into single target."""
@@ -3814,7 +4040,7 @@ class TestP4Transfer(TestP4TransferBase):
         file1 = os.path.join(inside, "file1")
         file2 = os.path.join(inside, "file2")
         file3 = os.path.join(inside, "file3")
-        create_file(file1, "Test content")
+        create_file(file1, TEST_CONTENT)
         create_file(file2, "Test content2")
         self.source.p4cmd('add', file1, file2)
         self.source.p4cmd('submit', '-d', 'files added')
@@ -3827,9 +4053,7 @@ class TestP4Transfer(TestP4TransferBase):
 
         filelog = self.source.p4.run_filelog('//depot/inside/file3')[0]
         self.logger.debug(filelog)
-        self.assertEqual(len(filelog.revisions[0].integrations), 2)
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "copy from")
-        self.assertEqual(filelog.revisions[0].integrations[1].how, "moved from")
+        self.assertIntegrationsHow(filelog.revisions[0], ["copy from", "moved from"])
 
         # We can't move onto
         recs = self.dumpDBFiles("db.integed")
@@ -3841,33 +4065,21 @@ class TestP4Transfer(TestP4TransferBase):
 
         # Convert copy -> branch - can't be done through front end
 
-        newrecs = []
-        for rec in recs:
-            if "@db.integed@ @//depot/inside/file3@ @//depot/inside/file1@" in rec:
-                rec = rec.replace("@ 0 1 0 1 4", "@ 0 1 0 1 2")     # 4->2
-                rec = rec.replace("@pv@", "@rv@")
-                newrecs.append(rec)
-            if "@db.integed@ @//depot/inside/file1@ @//depot/inside/file3@" in rec:
-                rec = rec.replace("@ 0 1 0 1 10", "@ 0 1 0 1 5")     # 10->5
-                rec = rec.replace("@pv@", "@rv@")
-                newrecs.append(rec)
-        self.logger.debug("Newrecs:", "\n".join(newrecs))
-        self.applyJournalPatch("\n".join(newrecs))
+        newrecs = patchJournalRecs(recs, COPY_TO_BRANCH_PATCHES)
+        if self.debugLogging:
+            self.logger.debug("Newrecs:\n%s", "\n".join(newrecs))
+        self.applyJournalPatch(newrecs)
 
         filelog = self.source.p4.run_filelog('//depot/inside/file3')[0]
         self.logger.debug(filelog)
-        self.assertEqual(len(filelog.revisions[0].integrations), 2)
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "branch from")
-        self.assertEqual(filelog.revisions[0].integrations[1].how, "moved from")
+        self.assertIntegrationsHow(filelog.revisions[0], ["branch from", "moved from"])
 
         self.run_P4Transfer()
         self.assertCounters(2, 2)
 
         filelog = self.target.p4.run_filelog('//depot/import/file3')[0]
         self.logger.debug(filelog)
-        self.assertEqual(2, len(filelog.revisions[0].integrations))
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "copy from")
-        self.assertEqual(filelog.revisions[0].integrations[1].how, "moved from")
+        self.assertIntegrationsHow(filelog.revisions[0], ["copy from", "moved from"])
 
     def testIntegCopyAndRenameFromOutside(self):
         """Test for integrating a copy and move into single target with integ coming from outside."""
@@ -3878,7 +4090,7 @@ class TestP4Transfer(TestP4TransferBase):
         file1 = os.path.join(outside, "file1")
         file2 = os.path.join(inside, "file2")
         file3 = os.path.join(inside, "file3")
-        create_file(file1, "Test content")
+        create_file(file1, TEST_CONTENT)
         create_file(file2, "Test content2")
         self.source.p4cmd('add', file1, file2)
         self.source.p4cmd('submit', '-d', 'files added')
@@ -3891,9 +4103,7 @@ class TestP4Transfer(TestP4TransferBase):
 
         filelog = self.source.p4.run_filelog('//depot/inside/file3')[0]
         self.logger.debug(filelog)
-        self.assertEqual(len(filelog.revisions[0].integrations), 2)
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "moved from")
-        self.assertEqual(filelog.revisions[0].integrations[1].how, "copy from")
+        self.assertIntegrationsHow(filelog.revisions[0], ["moved from", "copy from"])
 
         # We can't move onto
         recs = self.dumpDBFiles("db.integed")
@@ -3905,32 +4115,21 @@ class TestP4Transfer(TestP4TransferBase):
 
         # Convert copy -> branch - can't be done through front end
 
-        newrecs = []
-        for rec in recs:
-            if "@db.integed@ @//depot/inside/file3@ @//depot/outside/file1@" in rec:
-                rec = rec.replace("@ 0 1 0 1 4", "@ 0 1 0 1 2")     # 4->2
-                rec = rec.replace("@pv@", "@rv@")
-                newrecs.append(rec)
-            if "@db.integed@ @//depot/outside/file1@ @//depot/inside/file3@" in rec:
-                rec = rec.replace("@ 0 1 0 1 10", "@ 0 1 0 1 5")     # 10->5
-                rec = rec.replace("@pv@", "@rv@")
-                newrecs.append(rec)
-        self.logger.debug("Newrecs:", "\n".join(newrecs))
-        self.applyJournalPatch("\n".join(newrecs))
+        newrecs = patchJournalRecs(recs, OUTSIDE_COPY_TO_BRANCH_PATCHES)
+        if self.debugLogging:
+            self.logger.debug("Newrecs:\n%s", "\n".join(newrecs))
+        self.applyJournalPatch(newrecs)
 
         filelog = self.source.p4.run_filelog('//depot/inside/file3')[0]
         self.logger.debug(filelog)
-        self.assertEqual(len(filelog.revisions[0].integrations), 2)
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "moved from")
-        self.assertEqual(filelog.revisions[0].integrations[1].how, "branch from")
+        self.assertIntegrationsHow(filelog.revisions[0], ["moved from", "branch from"])
 
         self.run_P4Transfer()
         self.assertCounters(2, 2)
 
         filelog = self.target.p4.run_filelog('//depot/import/file3')[0]
         self.logger.debug(filelog)
-        self.assertEqual(1, len(filelog.revisions[0].integrations))
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "moved from")
+        self.assertIntegrationsHow(filelog.revisions[0], ["moved from"])
 
     def testIntegCopyAndRenameAsAdd(self):
         """Test for integrating a copy and move into single target - with target action add."""
@@ -3940,7 +4139,7 @@ class TestP4Transfer(TestP4TransferBase):
         file1 = os.path.join(inside, "file1")
         file2 = os.path.join(inside, "file2")
         file3 = os.path.join(inside, "file3")
-        create_file(file1, "Test content")
+        create_file(file1, TEST_CONTENT)
         create_file(file2, "Test content2")
         self.source.p4cmd('add', file1, file2)
         self.source.p4cmd('submit', '-d', 'files added')
@@ -3953,9 +4152,7 @@ class TestP4Transfer(TestP4TransferBase):
 
         filelog = self.source.p4.run_filelog('//depot/inside/file3')[0]
         self.logger.debug(filelog)
-        self.assertEqual(len(filelog.revisions[0].integrations), 2)
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "copy from")
-        self.assertEqual(filelog.revisions[0].integrations[1].how, "moved from")
+        self.assertIntegrationsHow(filelog.revisions[0], ["copy from", "moved from"])
 
         recs = self.dumpDBFiles("db.integed,db.rev,db.revhx")
         self.logger.debug(recs)
@@ -3969,51 +4166,21 @@ class TestP4Transfer(TestP4TransferBase):
 
         # Convert copy -> branch, and move/add -> add - can't be done through front end
 
-        newrecs = []
-        for rec in recs:
-            if "@db.integed@ @//depot/inside/file3@ @//depot/inside/file1@" in rec:
-                rec = rec.replace("@ 0 1 0 1 4", "@ 0 1 0 1 2")     # 4->2
-                rec = rec.replace("@pv@", "@rv@")
-                newrecs.append(rec)
-            if "@db.integed@ @//depot/inside/file1@ @//depot/inside/file3@" in rec:
-                rec = rec.replace("@ 0 1 0 1 10", "@ 0 1 0 1 5")     # 10->5
-                rec = rec.replace("@pv@", "@rv@")
-                newrecs.append(rec)
-            # move/add -> add
-            if "@db.rev@ @//depot/inside/file3@ 1 0 8" in rec:
-                rec = rec.replace("@//depot/inside/file3@ 1 0 8", "@//depot/inside/file3@ 1 0 0")     # 10->5
-                rec = rec.replace("@pv@", "@rv@")
-                newrecs.append(rec)
-            if "@db.revhx@ @//depot/inside/file3@ 1 0 8" in rec:
-                rec = rec.replace("@//depot/inside/file3@ 1 0 8", "@//depot/inside/file3@ 1 0 0")     # 10->5
-                rec = rec.replace("@pv@", "@rv@")
-                newrecs.append(rec)
-            # move/delete -> delete
-            if "@db.rev@ @//depot/inside/file1@ 1 0 7" in rec:
-                rec = rec.replace("@//depot/inside/file1@ 1 0 7", "@//depot/inside/file1@ 1 0 2")
-                rec = rec.replace("@pv@", "@rv@")
-                newrecs.append(rec)
-            if "@db.revhx@ @//depot/inside/file1@ 1 0 7" in rec:
-                rec = rec.replace("@//depot/inside/file1@ 1 0 7", "@//depot/inside/file1@ 1 0 2")
-                rec = rec.replace("@pv@", "@rv@")
-                newrecs.append(rec)
-        self.logger.debug("Newrecs:", "\n".join(newrecs))
-        self.applyJournalPatch("\n".join(newrecs))
+        newrecs = patchJournalRecs(recs, COPY_TO_BRANCH_PATCHES, MOVE_ACTION_PREFIXES)
+        if self.debugLogging:
+            self.logger.debug("Newrecs:\n%s", "\n".join(newrecs))
+        self.applyJournalPatch(newrecs)
 
         filelog = self.source.p4.run_filelog('//depot/inside/file3')[0]
         self.logger.debug(filelog)
-        self.assertEqual(len(filelog.revisions[0].integrations), 2)
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "branch from")
-        self.assertEqual(filelog.revisions[0].integrations[1].how, "moved from")
+        self.assertIntegrationsHow(filelog.revisions[0], ["branch from", "moved from"])
 
         self.run_P4Transfer()
         self.assertCounters(2, 2)
 
         filelog = self.target.p4.run_filelog('//depot/import/file3')[0]
         self.logger.debug(filelog)
-        self.assertEqual(2, len(filelog.revisions[0].integrations))
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "copy from")
-        self.assertEqual(filelog.revisions[0].integrations[1].how, "moved from")
+        self.assertIntegrationsHow(filelog.revisions[0], ["copy from", "moved from"])
 
     def testIntegCopyAndRenameAsAddFromOutside(self):
         """Test for integrating a copy and move into single target - when copy is from outside view."""
@@ -4026,10 +4193,10 @@ class TestP4Transfer(TestP4TransferBase):
         file3 = os.path.join(inside, "file3")
         outside_file4 = os.path.join(outside, "file4")
         outside_file5 = os.path.join(outside, "file5")
-        create_file(file1, "Test content")
-        create_file(file2, "Test content")
-        create_file(outside_file4, "Test content")
-        create_file(outside_file5, "Test content")
+        create_file(file1, TEST_CONTENT)
+        create_file(file2, TEST_CONTENT)
+        create_file(outside_file4, TEST_CONTENT)
+        create_file(outside_file5, TEST_CONTENT)
         self.source.p4cmd('add', file1, file2, outside_file4, outside_file5)
         self.source.p4cmd('submit', '-d', 'files added')
 
@@ -4059,31 +4226,21 @@ class TestP4Transfer(TestP4TransferBase):
         # @pv@ 0 @db.integed@ @//depot/outside/file5@ @//depot/inside/file3@ 0 1 1 2 10 3
 
         # Convert copy from -> merged from
-        newrecs = []
-        for rec in recs:
-            if "@db.integed@ @//depot/inside/file3@ @//depot/outside/file5@" in rec:
-                rec = rec.replace("@ 1 2 0 1 6", "@ 1 2 0 1 0")     # 6->0
-                rec = rec.replace("@pv@", "@rv@")
-                newrecs.append(rec)
-            if "@db.integed@ @//depot/outside/file5@ @//depot/inside/file3@" in rec:
-                rec = rec.replace("@ 0 1 1 2 10", "@ 0 1 1 2 1")     # 10->1
-                rec = rec.replace("@pv@", "@rv@")
-                newrecs.append(rec)
-        self.logger.debug("Newrecs:", "\n".join(newrecs))
-        self.applyJournalPatch("\n".join(newrecs))
+        newrecs = patchJournalRecs(recs, OUTSIDE_COPY_TO_MERGE_PATCHES)
+        if self.debugLogging:
+            self.logger.debug("Newrecs:\n%s", "\n".join(newrecs))
+        self.applyJournalPatch(newrecs)
 
         filelog = self.source.p4.run_filelog('//depot/inside/file3')[0]
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "moved from")
-        self.assertEqual(filelog.revisions[0].integrations[1].how, "copy from")
-        self.assertEqual(filelog.revisions[0].integrations[2].how, "merge from")
+        self.logger.debug(filelog)
+        self.assertIntegrationsHow(filelog.revisions[0], ["moved from", "copy from", "merge from"])
 
         self.run_P4Transfer()
         self.assertCounters(3, 2)
 
         filelog = self.target.p4.run_filelog('//depot/import/file3')[0]
         self.logger.debug(filelog)
-        self.assertEqual(1, len(filelog.revisions[0].integrations))
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "moved from")
+        self.assertIntegrationsHow(filelog.revisions[0], ["moved from"])
 
     def testIgnoredDelete(self):
         """Test for ignoring a delete and then doing it again"""
@@ -4092,7 +4249,7 @@ class TestP4Transfer(TestP4TransferBase):
         inside = localDirectory(self.source.client_root, "inside")
         file1 = os.path.join(inside, "file1")
         file2 = os.path.join(inside, "file2")
-        create_file(file1, "Test content")
+        create_file(file1, TEST_CONTENT)
 
         self.source.p4cmd('add', file1)
         self.source.p4cmd('submit', '-d', 'files added')
@@ -4155,21 +4312,13 @@ class TestP4Transfer(TestP4TransferBase):
         file2 = os.path.join(inside, "file2")
         file3 = os.path.join(inside, "file3")
         # outside_file1 = os.path.join(outside, 'outside_file1')
-        create_file(file1, "Test content")
+        create_file(file1, TEST_CONTENT)
         # create_file(outside_file1, "Some content")
 
         self.source.p4cmd('add', file1)
         self.source.p4cmd('submit', '-d', 'files added')
 
-        self.source.p4cmd('edit', file1)
-        append_to_file(file1, '\nmore')
-        self.source.p4cmd('submit', '-d', 'edited')
-        self.source.p4cmd('edit', file1)
-        append_to_file(file1, '\nmore')
-        self.source.p4cmd('submit', '-d', 'edited')
-        self.source.p4cmd('edit', file1)
-        append_to_file(file1, '\nmore')
-        self.source.p4cmd('submit', '-d', 'edited')
+        self.source.editAppendSubmit(file1, [('\nmore', 'edited')] * 3)
 
         # Generate a first rev which is an ignore of a delete - this will not be transferred.
         self.source.p4cmd('integ', '-Rb', '%s#4,4' % file1, file2)
@@ -4199,9 +4348,7 @@ class TestP4Transfer(TestP4TransferBase):
         self.assertEqual(filelog.revisions[0].integrations[0].how, "copy from")
         self.assertEqual(filelog.revisions[1].integrations[0].how, "branch from")
         self.assertEqual(filelog.revisions[2].integrations[0].how, "ignored")
-        self.assertEqual(filelog.revisions[0].action, "integrate")
-        self.assertEqual(filelog.revisions[1].action, "branch")
-        self.assertEqual(filelog.revisions[2].action, "delete")
+        self.assertRevisionActions(filelog, ["integrate", "branch", "delete"])
 
         self.run_P4Transfer()
         self.assertCounters(10, 10)
@@ -4211,11 +4358,8 @@ class TestP4Transfer(TestP4TransferBase):
         self.setupTransfer()
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        create_file(inside_file1, "Test content")
-        self.source.p4cmd('add', inside_file1)
-        self.source.p4cmd('submit', '-d', 'inside_file1 added')
+        inside_file1, inside_file2 = insideFiles(inside, 2)
+        self.source.addAndSubmit([(inside_file1, TEST_CONTENT)], 'inside_file1 added')
 
         self.source.p4cmd('edit', inside_file1)
         append_to_file(inside_file1, "\nmore stuff")
@@ -4236,20 +4380,15 @@ class TestP4Transfer(TestP4TransferBase):
 
         filelog = self.target.p4.run_filelog('//depot/import/inside_file2')[0]
         self.logger.debug(filelog)
-        self.assertEqual(len(filelog.revisions[0].integrations), 2)
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "copy from")
-        self.assertEqual(filelog.revisions[0].integrations[1].how, "ignored")
+        self.assertIntegrationsHow(filelog.revisions[0], ["copy from", "ignored"])
 
     def testIntegAddCopy(self):
         """Test for and add and copy into same revision."""
         self.setupTransfer()
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        create_file(inside_file1, "Test content")
-        self.source.p4cmd('add', inside_file1)
-        self.source.p4cmd('submit', '-d', 'inside_file1 added')
+        inside_file1, inside_file2 = insideFiles(inside, 2)
+        self.source.addAndSubmit([(inside_file1, TEST_CONTENT)], 'inside_file1 added')
 
         self.source.p4cmd('edit', inside_file1)
         append_to_file(inside_file1, "\nmore stuff")
@@ -4268,20 +4407,15 @@ class TestP4Transfer(TestP4TransferBase):
 
         filelog = self.target.p4.run_filelog('//depot/import/inside_file2')[0]
         self.logger.debug(filelog)
-        self.assertEqual(len(filelog.revisions[0].integrations), 2)
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "copy from")
-        self.assertEqual(filelog.revisions[0].integrations[1].how, "ignored")
+        self.assertIntegrationsHow(filelog.revisions[0], ["copy from", "ignored"])
 
     def testIntegBranchAndCopy(self):
         """Branch a file and copy it as well into same revision."""
         self.setupTransfer()
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        create_file(inside_file1, "Test content")
-        self.source.p4cmd('add', inside_file1)
-        self.source.p4cmd('submit', '-d', 'inside_file1 added')
+        inside_file1, inside_file2 = insideFiles(inside, 2)
+        self.source.addAndSubmit([(inside_file1, TEST_CONTENT)], 'inside_file1 added')
 
         self.source.p4cmd('integrate', inside_file1, inside_file2)
         self.source.p4cmd('submit', '-d', 'branch original')
@@ -4293,14 +4427,6 @@ class TestP4Transfer(TestP4TransferBase):
         append_to_file(inside_file2, "\nmore stuff")
         self.source.p4cmd('submit', '-d', 'inside_file2 edited')
 
-        class EditAcceptTheirs(P4.Resolver):
-            """
-            Required because of a special 'force' flag which is set if this is done interactively - doesn't
-            do the same as if you just resolve -at. Yuk!
-            """
-            def actionResolve(self, mergeInfo):
-                return 'at'
-
         self.source.p4cmd('integrate', inside_file2, inside_file1)
         self.source.p4.run_resolve(resolver=EditAcceptTheirs())
         self.source.p4cmd('integrate', '-f', inside_file2, inside_file1)
@@ -4309,29 +4435,22 @@ class TestP4Transfer(TestP4TransferBase):
 
         filelog = self.source.p4.run_filelog(inside_file1)[0]
         self.logger.debug(filelog)
-        self.assertEqual(2, len(filelog.revisions[0].integrations), 2)
-        self.assertEqual("branch from", filelog.revisions[0].integrations[0].how)
-        self.assertEqual("copy from", filelog.revisions[0].integrations[1].how)
+        self.assertIntegrationsHow(filelog.revisions[0], ["branch from", "copy from"])
 
         self.run_P4Transfer()
         self.assertCounters(5, 5)
 
         filelog = self.target.p4.run_filelog('//depot/import/inside_file1')[0]
         self.logger.debug(filelog)
-        self.assertEqual(1, len(filelog.revisions[0].integrations))
-        self.assertEqual("copy from", filelog.revisions[0].integrations[0].how)
+        self.assertIntegrationsHow(filelog.revisions[0], ["copy from"])
 
     def testBranchAndMoveSameTarget(self):
         """Branch a file and move/rename into same revision."""
         self.setupTransfer()
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        inside_file3 = os.path.join(inside, "inside_file3")
-        create_file(inside_file1, "Test content")
-        self.source.p4cmd('add', inside_file1)
-        self.source.p4cmd('submit', '-d', 'inside_file1 added')
+        inside_file1, inside_file2, inside_file3 = insideFiles(inside, 3)
+        self.source.addAndSubmit([(inside_file1, TEST_CONTENT)], 'inside_file1 added')
 
         self.source.p4cmd('integrate', inside_file1, inside_file2)
         self.source.p4cmd('submit', '-d', 'branch original')
@@ -4344,9 +4463,7 @@ class TestP4Transfer(TestP4TransferBase):
 
         filelog = self.source.p4.run_filelog(inside_file3)[0]
         self.logger.debug(filelog)
-        self.assertEqual(2, len(filelog.revisions[0].integrations), 2)
-        self.assertEqual("moved from", filelog.revisions[0].integrations[0].how)
-        self.assertEqual("copy from", filelog.revisions[0].integrations[1].how)
+        self.assertIntegrationsHow(filelog.revisions[0], ["moved from", "copy from"])
 
         # Convert copy from to branch from
         recs = self.dumpDBFiles("db.integed")
@@ -4354,52 +4471,31 @@ class TestP4Transfer(TestP4TransferBase):
 
         #  '@pv@ 1 @db.integed@ @//depot/inside/inside_file2@ @//depot/inside/inside_file3@ 0 1 0 1 10 3 ', 
         #  '@pv@ 1 @db.integed@ @//depot/inside/inside_file3@ @//depot/inside/inside_file2@ 0 1 0 1 4 3 ']
-        newrecs = []
-        for rec in recs:
-            if "@db.integed@ @//depot/inside/inside_file2@ @//depot/inside/inside_file3@" in rec:
-                rec = rec.replace("@ 0 1 0 1 10", "@ 0 1 0 1 3")     # 10->3: edit into->branch into
-                rec = rec.replace("@pv@", "@rv@")
-                newrecs.append(rec)
-            if "@db.integed@ @//depot/inside/inside_file3@ @//depot/inside/inside_file2@" in rec:
-                rec = rec.replace("@ 0 1 0 1 4", "@ 0 1 0 1 2")     # 4->2: copy from->branch from
-                rec = rec.replace("@pv@", "@rv@")
-                newrecs.append(rec)
-        self.logger.debug("Newrecs:", "\n".join(newrecs))
-        self.applyJournalPatch("\n".join(newrecs))
+        newrecs = patchJournalRecs(recs, MOVE_COPY_TO_BRANCH_PATCHES)
+        if self.debugLogging:
+            self.logger.debug("Newrecs:\n%s", "\n".join(newrecs))
+        self.applyJournalPatch(newrecs)
 
         filelog = self.source.p4.run_filelog(inside_file3)[0]
         self.logger.debug(filelog)
-        self.assertEqual(2, len(filelog.revisions[0].integrations), 2)
-        self.assertEqual("moved from", filelog.revisions[0].integrations[0].how)
-        self.assertEqual("branch from", filelog.revisions[0].integrations[1].how)
+        self.assertIntegrationsHow(filelog.revisions[0], ["moved from", "branch from"])
 
         self.run_P4Transfer()
         self.assertCounters(3, 3)
 
         filelog = self.target.p4.run_filelog('//depot/import/inside_file3')[0]
         self.logger.debug(filelog)
-        self.assertEqual(2, len(filelog.revisions[0].integrations))
-        self.assertEqual("moved from", filelog.revisions[0].integrations[0].how)
-        self.assertEqual("copy from", filelog.revisions[0].integrations[1].how)
+        self.assertIntegrationsHow(filelog.revisions[0], ["moved from", "copy from"])
 
     def testIntegAddMergeCopy(self):
         """Integrate an add/merge/copy of 3 revisions into single new target."""
         self.setupTransfer()
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        create_file(inside_file1, "Test content")
-        self.source.p4cmd('add', inside_file1)
-        self.source.p4cmd('submit', '-d', 'inside_file1 added')
-
-        self.source.p4cmd('edit', inside_file1)
-        append_to_file(inside_file1, "\nmore stuff")
-        self.source.p4cmd('submit', '-d', 'inside_file1 edited')
-
-        self.source.p4cmd('edit', inside_file1)
-        append_to_file(inside_file1, "\nYet more stuff")
-        self.source.p4cmd('submit', '-d', 'file edited again')
+        inside_file1, inside_file2 = insideFiles(inside, 2)
+        self.source.addAndSubmit([(inside_file1, TEST_CONTENT)], 'inside_file1 added')
+        self.source.editAppendSubmit(inside_file1, [("\nmore stuff", 'inside_file1 edited'),
+                                                    ("\nYet more stuff", 'file edited again')])
 
         self.source.p4cmd('integrate', "%s#1" % inside_file1, inside_file2)
         self.source.p4cmd('add', inside_file2)
@@ -4411,37 +4507,27 @@ class TestP4Transfer(TestP4TransferBase):
 
         filelog = self.source.p4.run_filelog('//depot/inside/inside_file2')[0]
         self.logger.debug(filelog)
-        self.assertEqual(len(filelog.revisions[0].integrations), 3)
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "copy from")
-        self.assertEqual(filelog.revisions[0].integrations[1].how, "merge from")
-        self.assertEqual(filelog.revisions[0].integrations[2].how, "add from")
+        self.assertIntegrationsHow(filelog.revisions[0], ["copy from", "merge from", "add from"])
 
         self.run_P4Transfer()
         self.assertCounters(4, 4)
 
         filelog = self.target.p4.run_filelog('//depot/import/inside_file2')[0]
         self.logger.debug(filelog)
-        self.assertEqual(len(filelog.revisions[0].integrations), 3)
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "copy from")
-        self.assertEqual(filelog.revisions[0].integrations[1].how, "ignored")
-        self.assertEqual(filelog.revisions[0].integrations[2].how, "ignored")
+        self.assertIntegrationsHow(filelog.revisions[0], ["copy from", "ignored", "ignored"])
 
     def testIntegSelectiveWithEdit(self):
         """Integrate cherry picked rev into a file."""
         self.setupTransfer()
-        self.target.p4cmd("configure", "set", "dm.integ.engine=2")
-        self.target.p4cmd("configure", "set", "dm.integ.engine=2")
+        self.target.configureSet("dm.integ.engine=2")
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        create_file(inside_file1, "Test content")
+        inside_file1, inside_file2 = insideFiles(inside, 2)
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', '-tbinary', inside_file1)
         self.source.p4cmd('submit', '-d', 'inside_file1 added')
 
-        create_file(inside_file2, "Test content 2")
-        self.source.p4cmd('add', inside_file2)
-        self.source.p4cmd('submit', '-d', 'inside_file2 added')
+        self.source.addAndSubmit([(inside_file2, "Test content 2")], 'inside_file2 added')
 
         self.source.p4cmd('edit', inside_file1)
         append_to_file(inside_file1, "\nmore stuff")
@@ -4453,100 +4539,67 @@ class TestP4Transfer(TestP4TransferBase):
 
         self.source.p4cmd('integrate', "%s#2,3" % inside_file1, inside_file2)
 
-        class EditResolve(P4.Resolver):
-            def resolve(self, mergeData):
-                result_path = mergeData.result_path
-                if not result_path:
-                    result_path = mergeData.your_path
-                create_file(result_path, """
+        self.source.p4.run_resolve(resolver=EditResolve("""
         Line 1
         Line 2 - changed
         Line 3 - edited
-        """)
-                return 'ae'
-
-        self.source.p4.run_resolve(resolver=EditResolve())
+        """))
         self.source.p4cmd('submit', '-d', "Merge with edit")
 
         filelog = self.source.p4.run_filelog('//depot/inside/inside_file2')[0]
         self.logger.debug(filelog)
-        self.assertEqual(len(filelog.revisions[0].integrations), 1)
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "edit from")
+        self.assertIntegrationsHow(filelog.revisions[0], ["edit from"])
 
         self.run_P4Transfer()
         self.assertCounters(5, 5)
 
         filelog = self.target.p4.run_filelog('//depot/import/inside_file2')[0]
         self.logger.debug(filelog)
-        self.assertEqual(len(filelog.revisions[0].integrations), 1)
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "edit from")
+        self.assertIntegrationsHow(filelog.revisions[0], ["edit from"])
 
     def testIntegDeleteProblem(self):
         "Reproduce a problem where integrate was resulting in a delete"
         self.setupTransfer()
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        inside_file3 = os.path.join(inside, "inside_file3")
-        inside_file4 = os.path.join(inside, "inside_file4")
-        create_file(inside_file1, 'Test content')
-        create_file(inside_file3, 'Test content')
-
-        self.source.p4cmd('add', inside_file1)
-        self.source.p4cmd('add', inside_file3)
-        self.source.p4cmd('submit', '-d', 'files added')
+        inside_file1, inside_file2, inside_file3, inside_file4 = insideFiles(inside, 4)
+        self.source.addAndSubmit([(inside_file1, TEST_CONTENT), (inside_file3, TEST_CONTENT)], 'files added')
 
-        self.source.p4cmd('edit', inside_file1)
-        self.source.p4cmd('edit', inside_file3)
-        append_to_file(inside_file1, "more content")
-        append_to_file(inside_file3, "more content")
-        self.source.p4cmd('submit', '-d', 'files edited')
+        self.source.editAndSubmit([inside_file1, inside_file3], lambda f: append_to_file(f, "more content"), 'files edited')
 
         self.source.p4cmd('integrate', '-2', inside_file1, inside_file2)
         self.source.p4cmd('integrate', '-2', inside_file3, inside_file4)
-        self.source.p4cmd('add', inside_file2)
-        self.source.p4cmd('add', inside_file4)
+        self.source.p4cmd('add', inside_file2, inside_file4)
         append_to_file(inside_file4, "and some more")
-        self.source.p4cmd('delete', inside_file1)
-        self.source.p4cmd('delete', inside_file3)
+        self.source.p4cmd('delete', inside_file1, inside_file3)
         self.source.p4cmd('submit', '-d', 'renamed old way')
 
         self.source.p4cmd('integrate', '-2', '-f', inside_file2, inside_file1)
         self.source.p4cmd('integrate', '-2', '-f', inside_file4, inside_file3)
         self.source.p4cmd('add', inside_file3)
         append_to_file(inside_file3, "yet more")
-        self.source.p4cmd('delete', inside_file2)
-        self.source.p4cmd('delete', inside_file4)
+        self.source.p4cmd('delete', inside_file2, inside_file4)
         self.source.p4cmd('submit', '-d', 'renamed back again')
 
         self.run_P4Transfer()
         self.assertCounters(4, 4)
 
         filelog = self.target.p4.run_filelog('//depot/import/inside_file1')
-        self.assertEqual(filelog[0].revisions[0].action, 'add')
-        self.assertEqual(filelog[0].revisions[1].action, 'delete')
+        self.assertRevisionActions(filelog[0], ['add', 'delete'])
         filelog = self.target.p4.run_filelog('//depot/import/inside_file2')
-        self.assertEqual(filelog[0].revisions[0].action, 'delete')
-        self.assertEqual(filelog[0].revisions[1].action, 'add')
+        self.assertRevisionActions(filelog[0], ['delete', 'add'])
         filelog = self.target.p4.run_filelog('//depot/import/inside_file3')
-        self.assertEqual(filelog[0].revisions[0].action, 'add')
-        self.assertEqual(filelog[0].revisions[1].action, 'delete')
+        self.assertRevisionActions(filelog[0], ['add', 'delete'])
         filelog = self.target.p4.run_filelog('//depot/import/inside_file4')
-        self.assertEqual(filelog[0].revisions[0].action, 'delete')
-        self.assertEqual(filelog[0].revisions[1].action, 'add')
+        self.assertRevisionActions(filelog[0], ['delete', 'add'])
 
     def testAddFrom(self):
         """Test for adding a file which has in itself then branched."""
         self.setupTransfer()
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        inside_file3 = os.path.join(inside, "inside_file3")
-        create_file(inside_file1, "Test content")
-        self.source.p4cmd('add', inside_file1)
-        self.source.p4cmd('submit', '-d', 'inside_file1 added')
+        inside_file1, inside_file2, inside_file3 = insideFiles(inside, 3)
+        self.source.addAndSubmit([(inside_file1, TEST_CONTENT)], 'inside_file1 added')
 
         self.source.p4cmd('delete', inside_file1)
         self.source.p4cmd('submit', '-d', 'inside_file1 deleted')
@@ -4554,14 +4607,14 @@ class TestP4Transfer(TestP4TransferBase):
         self.source.p4cmd('sync', "%s#1" % inside_file1)
         self.source.p4cmd('add', inside_file1)
         self.source.p4cmd('move', inside_file1, inside_file2)
+        # sync leaves the file read-only and neither add (of a deleted file) nor move make it writable
         os.chmod(inside_file2, stat.S_IWRITE + stat.S_IREAD)
         append_to_file(inside_file2, "more stuff")
         self.source.p4cmd('submit', '-d', 'inside_file2 created by branching with add')
 
         filelog = self.source.p4.run_filelog(inside_file2)[0]
         self.logger.debug(filelog)
-        self.assertEqual(len(filelog.revisions[0].integrations), 1)
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "add from")
+        self.assertIntegrationsHow(filelog.revisions[0], ["add from"])
 
         self.source.p4cmd('integrate', inside_file2, inside_file3)
         self.source.p4cmd('submit', '-d', 'inside_file3 created as copy')
@@ -4579,20 +4632,13 @@ class TestP4Transfer(TestP4TransferBase):
         self.setupTransfer()
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        inside_file3 = os.path.join(inside, "inside_file3")
-        create_file(inside_file1, "Test content")
-        create_file(inside_file2, "Test content")
-        self.source.p4cmd('add', inside_file1)
-        self.source.p4cmd('add', inside_file2)
-        self.source.p4cmd('submit', '-d', 'files added')
+        inside_file1, inside_file2, inside_file3 = insideFiles(inside, 3)
+        self.source.addAndSubmit([(inside_file1, TEST_CONTENT), (inside_file2, TEST_CONTENT)], 'files added')
 
         self.source.p4cmd('integrate', inside_file2, inside_file3)
         self.source.p4cmd('submit', '-d', 'branched file')
 
-        self.source.p4cmd('delete', inside_file1)
-        self.source.p4cmd('delete', inside_file2)
+        self.source.p4cmd('delete', inside_file1, inside_file2)
         self.source.p4cmd('submit', '-d', 'files deleted')
 
         with self.source.p4.at_exception_level(P4.P4.RAISE_ERRORS):
@@ -4600,21 +4646,21 @@ class TestP4Transfer(TestP4TransferBase):
             self.source.p4cmd('sync', "%s#1" % '//depot/inside/inside_file2')
             self.source.p4cmd('delete', '//depot/inside/inside_file1')
             self.source.p4cmd('delete', '//depot/inside/inside_file2')
-        self.source.p4cmd('opened')
+        if self.debugLogging:
+            self.source.p4cmd('opened')     # Diagnostic only - p4cmd logs the output
         try:
             self.source.p4cmd('submit', '-d', 'files deleted again')
         except Exception as e:
             self.logger.info(str(e))
             err = self.source.p4.errors[0]
-            if re.search("Submit failed -- fix problems above then", err):
-                m = re.search(r"p4 submit -c (\d+)", err)
+            if SUBMIT_FAILED_RE.search(err):
+                m = SUBMIT_CHANGE_RE.search(err)
                 if m:
                     self.source.p4cmd('submit', '-c', m.group(1))
 
         filelog = self.source.p4.run_filelog('//depot/inside/inside_file1')[0]
         self.logger.debug(filelog)
-        self.assertEqual(filelog.revisions[0].action, 'delete')
-        self.assertEqual(filelog.revisions[1].action, 'delete')
+        self.assertRevisionActions(filelog, ['delete', 'delete'])
 
         self.source.p4cmd('integrate', inside_file2, inside_file3)
         self.source.p4cmd('submit', '-d', 'integrated delete')
@@ -4628,8 +4674,7 @@ class TestP4Transfer(TestP4TransferBase):
 
         filelog = self.target.p4.run_filelog('//depot/import/inside_file1')[0]
         self.logger.debug(filelog)
-        self.assertEqual(filelog.revisions[0].action, 'delete')
-        self.assertEqual(filelog.revisions[1].action, 'delete')
+        self.assertRevisionActions(filelog, ['delete', 'delete'])
 
     def testIntegDeleteIgnore(self):
         """Test for an integrated delete with ignore."""
@@ -4637,21 +4682,15 @@ class TestP4Transfer(TestP4TransferBase):
 
         inside = localDirectory(self.source.client_root, "inside")
         outside = localDirectory(self.source.client_root, "outside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        inside_file3 = os.path.join(inside, "inside_file3")
-        inside_file4 = os.path.join(inside, "inside_file4")
+        inside_file1, inside_file2, inside_file3, inside_file4 = insideFiles(inside, 4)
         outside_file1 = os.path.join(outside, 'outside_file1')
         outside_file2 = os.path.join(outside, 'outside_file2')
-        create_file(inside_file1, "Test content")
-        create_file(inside_file4, "Test content")
-        create_file(outside_file1, "Some content")
-        create_file(outside_file2, "Some content")
-        self.source.p4cmd('add', inside_file1)
-        self.source.p4cmd('add', inside_file4)
-        self.source.p4cmd('add', outside_file1)
-        self.source.p4cmd('add', outside_file2)
-        self.source.p4cmd('submit', '-d', 'files added')
+        self.source.addAndSubmit([
+            (inside_file1, TEST_CONTENT),
+            (inside_file4, TEST_CONTENT),
+            (outside_file1, "Some content"),
+            (outside_file2, "Some content"),
+        ], 'files added')
 
         self.source.p4cmd('delete', inside_file4)
         self.source.p4cmd('submit', '-d', 'deleted file')
@@ -4670,8 +4709,7 @@ class TestP4Transfer(TestP4TransferBase):
         self.assertEqual(filelog.revisions[0].action, 'delete')
         filelog = self.source.p4.run_filelog('//depot/inside/inside_file4')[0]
         self.logger.debug(filelog)
-        self.assertEqual(filelog.revisions[0].action, 'delete')
-        self.assertEqual(filelog.revisions[1].action, 'delete')
+        self.assertRevisionActions(filelog, ['delete', 'delete'])
 
         self.run_P4Transfer()
         self.assertCounters(3, 3)
@@ -4691,11 +4729,8 @@ class TestP4Transfer(TestP4TransferBase):
         self.setupTransfer()
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        create_file(inside_file1, "Test content")
-        self.source.p4cmd('add', inside_file1)
-        self.source.p4cmd('submit', '-d', 'files added')
+        inside_file1, inside_file2 = insideFiles(inside, 2)
+        self.source.addAndSubmit([(inside_file1, TEST_CONTENT)], 'files added')
 
         self.source.p4cmd('integ', inside_file1, inside_file2)
         self.source.p4cmd('submit', '-d', 'create file2')
@@ -4715,15 +4750,10 @@ class TestP4Transfer(TestP4TransferBase):
         self.logger.debug(recs)
         # @pv@ 9 @db.rev@ @//depot/inside/inside_file2@ 3 0 2 5 1430226630 0 00000000000000000000000000000000 -1 0 0 @//depot/inside/inside_file2@ @1.5@ 0
         # @pv@ 9 @db.rev@ @//depot/inside/inside_file2@ 2 0 1 4 1430226630 1430226630 8BFA8E068410...5264D150 12 0 0 @//depot/inside/inside_file2@ @1.4@ 0
-        newrecs = []
-        for rec in recs:
-            if "@db.rev@ @//depot/inside/inside_file2@ 3" in rec:
-                rec = rec.replace("@ 3 0 2 5", "@ 2 0 2 4")     # chg 5->4,
-                rec = rec.replace("@1.5@", "@1.4@")             # lbrRev
-                rec = rec.replace("@pv@", "@rv@")
-                newrecs.append(rec)
-        self.logger.debug("Newrecs:", "\n".join(newrecs))
-        self.applyJournalPatch("\n".join(newrecs))
+        newrecs = patchJournalRecs(recs, REV3_TO_REV2_PATCHES)
+        if self.debugLogging:
+            self.logger.debug("Newrecs:\n%s", "\n".join(newrecs))
+        self.applyJournalPatch(newrecs)
 
         filelog = self.source.p4.run_filelog('//depot/inside/inside_file2')[0]
         self.logger.debug(filelog)
@@ -4743,11 +4773,8 @@ class TestP4Transfer(TestP4TransferBase):
         self.setupTransfer()
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        create_file(inside_file1, "Test content")
-        self.source.p4cmd('add', inside_file1)
-        self.source.p4cmd('submit', '-d', 'inside_file1 added')
+        inside_file1, inside_file2 = insideFiles(inside, 2)
+        self.source.addAndSubmit([(inside_file1, TEST_CONTENT)], 'inside_file1 added')
 
         self.source.p4cmd('integrate', inside_file1, inside_file2)
         self.source.p4cmd('submit', '-d', 'inside_file2 added')
@@ -4771,19 +4798,9 @@ class TestP4Transfer(TestP4TransferBase):
         # @pv@ 0 @db.revcx@ 4 @//depot/inside/inside_file2@ 2 1
         # @pv@ 9 @db.revhx@ @//depot/inside/inside_file2@ 2 0 1 4 1423760150 1423760150 1141C16D0...BA151F6054F1D8 28 0 0 @//depot/inside/inside_file2@ @1.4@ 0
         # Change action record from 1 (edit) to 4 (integ)
-        newrecs = []
-        for rec in recs:
-            if "@db.rev@ @//depot/inside/inside_file2@ 2 0 1 4" in rec:
-                rec = rec.replace("@ 2 0 1 4 ", "@ 2 0 4 4 ")
-                newrecs.append(rec.replace("@pv@", "@rv@"))
-            elif "@db.revcx@ 4 @//depot/inside/inside_file2@ 2 1" in rec:
-                rec = rec.replace("@ 2 1", "@ 2 4")
-                newrecs.append(rec.replace("@pv@", "@rv@"))
-            elif "@db.revhx@ @//depot/inside/inside_file2@ 2 0 1 4" in rec:
-                rec = rec.replace("@ 2 0 1 4 ", "@ 2 0 4 4 ")
-                newrecs.append(rec.replace("@pv@", "@rv@"))
+        newrecs = patchJournalRecs(recs, [], EDIT_TO_INTEG_PREFIXES)
         self.logger.debug(newrecs)
-        self.applyJournalPatch("\n".join(newrecs))
+        self.applyJournalPatch(newrecs)
 
         filelog = self.source.p4.run_filelog(inside_file2)
         self.logger.debug(filelog)
@@ -4794,14 +4811,13 @@ class TestP4Transfer(TestP4TransferBase):
 
         filelog = self.target.p4.run_filelog('//depot/import/inside_file2')[0]
         self.logger.debug(filelog)
-        self.assertEqual(len(filelog.revisions[0].integrations), 1)
-        self.assertEqual(filelog.revisions[0].integrations[0].how, "ignored")
+        self.assertIntegrationsHow(filelog.revisions[0], ["ignored"])
         self.assertEqual(filelog.revisions[0].action, "edit")
 
     def testIntegI(self):
         """Test for integ -i required - only necessary with older integ.engine"""
         self.setupTransfer()
-        self.target.p4cmd("configure", "set", "dm.integ.engine=2")
+        self.target.configureSet("dm.integ.engine=2")
 
         inside = localDirectory(self.source.client_root, "inside")
         original_file = os.path.join(inside, 'original', 'original_file')
@@ -4858,15 +4874,13 @@ class TestP4Transfer(TestP4TransferBase):
         self.source.p4.run_obliterate('-y', outside_file1)
 
         filelog = self.source.p4.run_filelog('//depot/inside/inside_file2')
-        self.assertEqual(filelog[0].revisions[0].action, 'integrate')
-        self.assertEqual(filelog[0].revisions[1].action, 'branch')
+        self.assertRevisionActions(filelog[0], ['integrate', 'branch'])
 
         self.run_P4Transfer()
         self.assertCounters(4, 2)
 
         filelog = self.target.p4.run_filelog('//depot/import/inside_file2')
-        self.assertEqual(filelog[0].revisions[0].action, 'edit')
-        self.assertEqual(filelog[0].revisions[1].action, 'add')
+        self.assertRevisionActions(filelog[0], ['edit', 'add'])
 
     def testKeywords(self):
         "Look for files with keyword expansion"
@@ -4880,8 +4894,8 @@ class TestP4Transfer(TestP4TransferBase):
             files.append(os.path.join(inside, fname))
 
         for fname in files:
-            create_file(fname, 'Test content')
-            self.source.p4cmd('add', fname)
+            create_file(fname, TEST_CONTENT)
+        self.source.p4cmd('add', *files)
 
         self.source.p4.run_reopen("-t", "ktext", files[0])
         self.source.p4.run_reopen("-t", "kxtext", files[1])
@@ -4922,8 +4936,8 @@ class TestP4Transfer(TestP4TransferBase):
             files.append(os.path.join(inside, fname))
 
         for fname in files:
-            create_file(fname, 'Test content')
-            self.source.p4cmd('add', fname)
+            create_file(fname, TEST_CONTENT)
+        self.source.p4cmd('add', *files)
 
         self.source.p4cmd('submit', '-d', 'File(s) added')
 
@@ -4937,17 +4951,11 @@ class TestP4Transfer(TestP4TransferBase):
         self.setupTransfer()
 
         inside = localDirectory(self.source.client_root, "inside")
-        inside_file1 = os.path.join(inside, "inside_file1")
-        inside_file2 = os.path.join(inside, "inside_file2")
-        inside_file3 = os.path.join(inside, "inside_file3")
-        inside_file4 = os.path.join(inside, "inside_file4")
+        inside_file1, inside_file2, inside_file3, inside_file4 = insideFiles(inside, 4)
 
-        create_file(inside_file1, "Test content")
-        create_file(inside_file2, "Test content")
-        create_file(inside_file3, "Test content")
-        self.source.p4cmd('add', '-t', 'text+S2', inside_file1)
-        self.source.p4cmd('add', '-t', 'binary+S', inside_file2)
-        self.source.p4cmd('add', '-t', 'binary+S', inside_file3)
+        for f in (inside_file1, inside_file2, inside_file3):
+            create_file(f, TEST_CONTENT)
+        self.source.p4cmdBatch('add', {inside_file1: 'text+S2', inside_file2: 'binary+S', inside_file3: 'binary+S'})
         self.source.p4cmd('submit', '-d', 'files added')
 
         self.source.p4cmd('integrate', inside_file3, inside_file4)
@@ -4958,10 +4966,8 @@ class TestP4Transfer(TestP4TransferBase):
         self.source.p4cmd('delete', inside_file2)
         self.source.p4cmd('submit', '-d', 'version 2')
 
-        self.source.p4cmd('edit', inside_file1)
-        append_to_file(inside_file1, 'More text')
-        self.source.p4cmd('edit', inside_file3)
-        append_to_file(inside_file1, 'More textasdf')
+        self.source.p4cmd('edit', inside_file1, inside_file3)
+        append_to_file(inside_file1, 'More textMore textasdf')
         self.source.p4cmd('submit', '-d', 'version 3')
 
         self.source.p4cmd('integrate', inside_file3, inside_file4)
@@ -4975,12 +4981,12 @@ class TestP4Transfer(TestP4TransferBase):
         revisions = filelog[0].revisions
         self.logger.debug('test:', revisions)
         self.assertEqual(len(revisions), 3)
-        for rev in revisions:
-            self.logger.debug('test:', rev.rev, rev.action, rev.digest)
-            self.logger.debug(self.target.p4.run_print('//depot/import/inside_file1#%s' % rev.rev))
+        if self.debugLogging:
+            for rev in revisions:
+                self.logger.debug('test:', rev.rev, rev.action, rev.digest)
+                self.logger.debug(self.target.p4.run_print('//depot/import/inside_file1#%s' % rev.rev))
         filelog = self.target.p4.run_filelog('//depot/import/inside_file4')
-        self.assertEqual(filelog[0].revisions[0].action, 'integrate')
-        self.assertEqual(filelog[0].revisions[1].action, 'purge')
+        self.assertRevisionActions(filelog[0], ['integrate', 'purge'])
 
     def testAddAfterPurge(self):
         """Tests for files added after being purged"""
@@ -4989,7 +4995,7 @@ class TestP4Transfer(TestP4TransferBase):
         inside = localDirectory(self.source.client_root, "inside")
         inside_file1 = os.path.join(inside, "inside_file1")
 
-        create_file(inside_file1, "Test content")
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', '-t', 'text', inside_file1)
         self.source.p4cmd('submit', '-d', 'files added')
 
@@ -5007,12 +5013,11 @@ class TestP4Transfer(TestP4TransferBase):
         revisions = filelog[0].revisions
         self.logger.debug('test:', revisions)
         self.assertEqual(len(revisions), 2)
-        for rev in revisions:
-            self.logger.debug('test:', rev.rev, rev.action, rev.digest)
-            self.logger.debug(self.target.p4.run_print('//depot/import/inside_file1#%s' % rev.rev))
-        filelog = self.target.p4.run_filelog('//depot/import/inside_file1')
-        self.assertEqual(filelog[0].revisions[0].action, 'edit')
-        self.assertEqual(filelog[0].revisions[1].action, 'add')
+        if self.debugLogging:
+            for rev in revisions:
+                self.logger.debug('test:', rev.rev, rev.action, rev.digest)
+                self.logger.debug(self.target.p4.run_print('//depot/import/inside_file1#%s' % rev.rev))
+        self.assertRevisionActions(filelog[0], ['edit', 'add'])
 
     def testBranchUndoAfterPurge(self):
         """Tests for files branched ontop of purged revs"""
@@ -5021,7 +5026,7 @@ class TestP4Transfer(TestP4TransferBase):
         inside = localDirectory(self.source.client_root, "inside")
         inside_file1 = os.path.join(inside, "inside_file1")
 
-        create_file(inside_file1, "Test content")
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', '-t', 'text', inside_file1)
         self.source.p4cmd('submit', '-d', 'files added')
 
@@ -5042,21 +5047,19 @@ class TestP4Transfer(TestP4TransferBase):
         revisions = filelog[0].revisions
         self.logger.debug('test:', revisions)
         self.assertEqual(len(revisions), 3)
-        for rev in revisions:
-            self.logger.debug('test:', rev.rev, rev.action, rev.digest)
-            self.logger.debug(self.target.p4.run_print('//depot/import/inside_file1#%s' % rev.rev))
-        filelog = self.target.p4.run_filelog('//depot/import/inside_file1')
-        self.assertEqual(filelog[0].revisions[0].action, 'integrate')
-        self.assertEqual(filelog[0].revisions[1].action, 'edit')
+        if self.debugLogging:
+            for rev in revisions:
+                self.logger.debug('test:', rev.rev, rev.action, rev.digest)
+                self.logger.debug(self.target.p4.run_print('//depot/import/inside_file1#%s' % rev.rev))
+        self.assertRevisionActions(filelog[0], ['integrate', 'edit'])
 
     def testBranchPerformance(self):
         "Branch lots of files and test performance"
         self.setupTransfer()
 
         inside = localDirectory(self.source.client_root, "inside")
-        for i in range(99):
-            file = os.path.join(inside, "original", "file%d" % i)
-            create_file(file, "Test content")
+        original = os.path.join(inside, "original")
+        create_files([(os.path.join(original, "file%d" % i), TEST_CONTENT) for i in range(99)])
         self.source.p4cmd('add', "//depot/inside/...")
         self.source.p4cmd('submit', '-d', 'files added')
 
@@ -5073,7 +5076,7 @@ class TestP4Transfer(TestP4TransferBase):
         inside = localDirectory(self.source.client_root, "inside")
         inside_file1 = os.path.join(inside, "inside_file1")
 
-        create_file(inside_file1, "Test content")
+        create_file(inside_file1, TEST_CONTENT)
         self.source.p4cmd('add', inside_file1)
         self.source.p4cmd('submit', '-d', 'inside_file1 added')
 
@@ -5097,12 +5100,13 @@ class TestP4Transfer(TestP4TransferBase):
         revisions = filelog[0].revisions
         self.logger.debug('test:', revisions)
         self.assertEqual(len(revisions), 4)
-        for rev in revisions:
-            self.logger.debug('test:', rev.rev, rev.action, rev.digest)
-            self.logger.debug(self.target.p4.run_print('//depot/import/inside_file1#%s' % rev.rev))
-        for rev in self.source.p4.run_filelog('//depot/inside/inside_file1')[0].revisions:
-            self.logger.debug('test-src:', rev.rev, rev.action, rev.digest)
-            self.logger.debug(self.source.p4.run_print('//depot/inside/inside_file1#%s' % rev.rev))
+        if self.debugLogging:
+            for rev in revisions:
+                self.logger.debug('test:', rev.rev, rev.action, rev.digest)
+                self.logger.debug(self.target.p4.run_print('//depot/import/inside_file1#%s' % rev.rev))
+            for rev in self.source.p4.run_filelog('//depot/inside/inside_file1')[0].revisions:
+                self.logger.debug('test-src:', rev.rev, rev.action, rev.digest)
+                self.logger.debug(self.source.p4.run_print('//depot/inside/inside_file1#%s' % rev.rev))
 
         self.assertEqual(revisions[3].action, "add")
         self.assertEqual(revisions[1].action, "add")
@@ -5118,7 +5122,7 @@ class TestP4Transfer(TestP4TransferBase):
 
         inside = localDirectory(self.source.client_root, "inside")
         inside_file1 = os.path.join(inside, "inside_file1")
-        create_file(inside_file1, 'Test content')
+        create_file(inside_file1, TEST_CONTENT)
 
         self.source.p4cmd('add', "-t", "xtext", inside_file1)
         self.source.p4cmd('submit', '-d', 'inside_file1 added')
@@ -5160,7 +5164,7 @@ class TestP4Transfer(TestP4TransferBase):
 
         inside = localDirectory(self.source.client_root, "inside")
         inside_file1 = os.path.join(inside, "inside_file1")
-        create_file(inside_file1, 'Test content')
+        create_file(inside_file1, TEST_CONTENT)
 
         self.source.p4cmd('add', inside_file1)
         self.source.p4cmd('submit', '-d', 'inside_file1 added')
@@ -5181,15 +5185,7 @@ class TestP4Transfer(TestP4TransferBase):
         "Test basic source/target being a stream"
         self.setupTransfer()
 
-        d = self.source.p4.fetch_depot('src_streams')
-        d['Type'] = 'stream'
-        self.source.p4.save_depot(d)
-        s = self.source.p4.fetch_stream('-t', 'mainline', '//src_streams/main')
-        self.source.p4.save_stream(s)
-
-        d = self.target.p4.fetch_depot('targ_streams')
-        d['Type'] = 'stream'
-        self.target.p4.save_depot(d)
+        self.setupStreamDepots(targetMainline=False)
 
         config = self.getDefaultOptions()
         config['views'] = []
@@ -5207,7 +5203,7 @@ class TestP4Transfer(TestP4TransferBase):
         inside = localDirectory(self.source.client_root, "inside")
 
         file1 = os.path.join(inside, 'file1')
-        create_file(file1, "Test content")
+        create_file(file1, TEST_CONTENT)
         self.source.p4cmd('add', file1)
         self.source.p4cmd('submit', '-d', "Added files")
 
@@ -5235,18 +5231,7 @@ class TestP4Transfer(TestP4TransferBase):
         "Test source/target being streams with multiples"
         self.setupTransfer()
 
-        d = self.source.p4.fetch_depot('src_streams')
-        d['Type'] = 'stream'
-        self.source.p4.save_depot(d)
-        s = self.source.p4.fetch_stream('-t', 'mainline', '//src_streams/main')
-        self.source.p4.save_stream(s)
-
-        d = self.target.p4.fetch_depot('targ_streams')
-        d['Type'] = 'stream'
-        self.target.p4.save_depot(d)
-
-        s = self.target.p4.fetch_stream('-t', 'mainline', '//targ_streams/main')
-        self.target.p4.save_stream(s)
+        self.setupStreamDepots()
 
         config = self.getDefaultOptions()
         config['views'] = []
@@ -5264,7 +5249,7 @@ class TestP4Transfer(TestP4TransferBase):
         inside = localDirectory(self.source.client_root, "inside")
 
         file1 = os.path.join(inside, 'file1')
-        create_file(file1, "Test content")
+        create_file(file1, TEST_CONTENT)
         self.source.p4cmd('add', file1)
         self.source.p4cmd('submit', '-d', "Added files")
 
@@ -5284,12 +5269,12 @@ class TestP4Transfer(TestP4TransferBase):
 
         changes = self.target.p4cmd('changes', '//targ_streams/...')
         self.assertEqual(2, len(changes))
-        filelog = self.target.p4.run_filelog('//targ_streams/rel1/...')
-        self.assertEqual(1, len(filelog))
-        self.assertEqual(filelog[0].revisions[0].action, "add")
-        filelog = self.target.p4.run_filelog('//targ_streams/rel2/...')
-        self.assertEqual(1, len(filelog))
+        filelog = self.target.p4.run_filelog('//targ_streams/rel1/...', '//targ_streams/rel2/...')
+        self.assertEqual(2, len(filelog))
+        self.assertTrue(filelog[0].depotFile.startswith('//targ_streams/rel1/'))
+        self.assertTrue(filelog[1].depotFile.startswith('//targ_streams/rel2/'))
         self.assertEqual(filelog[0].revisions[0].action, "add")
+        self.assertEqual(filelog[1].revisions[0].action, "add")
 
         # Double wildcards
         config['stream_views'] = [{'src': '//src_*/rel*',
@@ -5303,7 +5288,7 @@ class TestP4Transfer(TestP4TransferBase):
         self.source.p4.save_client(c)
 
         file1 = os.path.join(inside, 'file2')
-        create_file(file1, "Test content")
+        create_file(file1, TEST_CONTENT)
         self.source.p4cmd('add', file1)
         self.source.p4cmd('submit', '-d', "Added file2")
 
@@ -5311,13 +5296,11 @@ class TestP4Transfer(TestP4TransferBase):
 
         changes = self.target.p4cmd('changes', '//targ_streams/...')
         self.assertEqual(3, len(changes))
-        filelog = self.target.p4.run_filelog('//targ_streams/rel1/...')
-        self.assertEqual(2, len(filelog))
-        self.assertEqual("add", filelog[0].revisions[0].action)
-        self.assertEqual("add", filelog[1].revisions[0].action)
-        filelog = self.target.p4.run_filelog('//targ_streams/rel2/...')
-        self.assertEqual(1, len(filelog))
-        self.assertEqual("add", filelog[0].revisions[0].action)
+        filelog = self.target.p4.run_filelog('//targ_streams/rel1/...', '//targ_streams/rel2/...')
+        self.assertEqual(3, len(filelog))
+        self.assertTrue(filelog[1].depotFile.startswith('//targ_streams/rel1/'))
+        self.assertTrue(filelog[2].depotFile.startswith('//targ_streams/rel2/'))
+        self.assertEqual(["add"] * 3, [f.revisions[0].action for f in filelog])
 
         # Now change source streams, and replicate again - expecting new stream to be picked up
         s = self.source.p4.fetch_stream('-t', 'release', '-P', '//src_streams/main', '//src_streams/rel3')
@@ -5337,18 +5320,7 @@ class TestP4Transfer(TestP4TransferBase):
         "Test source/target being streams with multiple source/target matching"
         self.setupTransfer()
 
-        d = self.source.p4.fetch_depot('src_streams')
-        d['Type'] = 'stream'
-        self.source.p4.save_depot(d)
-        s = self.source.p4.fetch_stream('-t', 'mainline', '//src_streams/main')
-        self.source.p4.save_stream(s)
-
-        d = self.target.p4.fetch_depot('targ_streams')
-        d['Type'] = 'stream'
-        self.target.p4.save_depot(d)
-
-        s = self.target.p4.fetch_stream('-t', 'mainline', '//targ_streams/main')
-        self.target.p4.save_stream(s)
+        self.setupStreamDepots()
 
         config = self.getDefaultOptions()
         config['views'] = []
@@ -5374,7 +5346,7 @@ class TestP4Transfer(TestP4TransferBase):
         inside = localDirectory(self.source.client_root, "inside")
 
         file1 = os.path.join(inside, 'file1')
-        create_file(file1, "Test content")
+        create_file(file1, TEST_CONTENT)
         self.source.p4cmd('add', file1)
         self.source.p4cmd('submit', '-d', "Added files")
 
@@ -5390,22 +5362,110 @@ class TestP4Transfer(TestP4TransferBase):
 
         changes = self.target.p4cmd('changes', '//targ_streams/...')
         self.assertEqual(3, len(changes))
-        filelog = self.target.p4.run_filelog('//targ_streams/rel1/...')
-        self.assertEqual(1, len(filelog))
-        self.assertEqual("branch", filelog[0].revisions[0].action)
-        filelog = self.target.p4.run_filelog('//targ_streams/rel2/...')
-        self.assertEqual(1, len(filelog))
+        filelog = self.target.p4.run_filelog('//targ_streams/rel1/...', '//targ_streams/rel2/...')
+        self.assertEqual(2, len(filelog))
+        self.assertTrue(filelog[0].depotFile.startswith('//targ_streams/rel1/'))
+        self.assertTrue(filelog[1].depotFile.startswith('//targ_streams/rel2/'))
         self.assertEqual("branch", filelog[0].revisions[0].action)
+        self.assertEqual("branch", filelog[1].revisions[0].action)
+
+
+class TestPatchJournalRecs(unittest.TestCase):
+    """Checks the journal patch tables against records like those in the test comments - no servers needed"""
+
+    def testCopyToBranch(self):
+        "Integed how 4 -> 2 and 10 -> 5 between file1 and file3 - records for other files are dropped"
+        recs = ['@pv@ 0 @db.integed@ @//depot/inside/file1@ @//depot/inside/file3@ 0 1 0 1 10 5 ',
+                '@pv@ 0 @db.integed@ @//depot/inside/file2@ @//depot/inside/file3@ 0 1 0 1 15 5 ',
+                '@pv@ 0 @db.integed@ @//depot/inside/file3@ @//depot/inside/file1@ 0 1 0 1 4 5 ',
+                '@pv@ 0 @db.integed@ @//depot/inside/file3@ @//depot/inside/file2@ 0 1 0 1 14 5 ']
+        self.assertEqual(['@rv@ 0 @db.integed@ @//depot/inside/file1@ @//depot/inside/file3@ 0 1 0 1 5 5 ',
+                          '@rv@ 0 @db.integed@ @//depot/inside/file3@ @//depot/inside/file1@ 0 1 0 1 2 5 '],
+                         patchJournalRecs(recs, COPY_TO_BRANCH_PATCHES))
+
+    def testHowIsWholeField(self):
+        "A how which only starts with the one being patched is left alone"
+        recs = ['@pv@ 0 @db.integed@ @//depot/inside/file3@ @//depot/inside/file1@ 0 1 0 1 41 5 ']
+        self.assertEqual([], patchJournalRecs(recs, COPY_TO_BRANCH_PATCHES))
+
+    def testOutsideCopyToMerge(self):
+        "Integed how 6 -> 0 and 10 -> 1 between outside/file5 and file3"
+        recs = ['@pv@ 0 @db.integed@ @//depot/inside/file3@ @//depot/outside/file5@ 1 2 0 1 6 3 ',
+                '@pv@ 0 @db.integed@ @//depot/outside/file5@ @//depot/inside/file3@ 0 1 1 2 10 3 ']
+        self.assertEqual(['@rv@ 0 @db.integed@ @//depot/inside/file3@ @//depot/outside/file5@ 1 2 0 1 0 3 ',
+                          '@rv@ 0 @db.integed@ @//depot/outside/file5@ @//depot/inside/file3@ 0 1 1 2 1 3 '],
+                         patchJournalRecs(recs, OUTSIDE_COPY_TO_MERGE_PATCHES))
+
+    def testMoveActionPrefixes(self):
+        "Prefix table used with regexes - rev action 8 (move/add) -> 0 (add) in db.rev and db.revhx"
+        tail = '2 1618248262 1618248262 8BFA8E0684108F419933A5995264D150 12 0 0 @//depot/inside/file3@ @1.2@ 0 '
+        recs = ['@pv@ 9 @db.rev@ @//depot/inside/file3@ 1 0 8 ' + tail,
+                '@pv@ 9 @db.revhx@ @//depot/inside/file3@ 1 0 8 ' + tail,
+                '@pv@ 0 @db.integed@ @//depot/inside/file3@ @//depot/inside/file1@ 0 1 0 1 4 5 ']
+        self.assertEqual(['@rv@ 9 @db.rev@ @//depot/inside/file3@ 1 0 0 ' + tail,
+                          '@rv@ 9 @db.revhx@ @//depot/inside/file3@ 1 0 0 ' + tail,
+                          '@rv@ 0 @db.integed@ @//depot/inside/file3@ @//depot/inside/file1@ 0 1 0 1 2 5 '],
+                         patchJournalRecs(recs, COPY_TO_BRANCH_PATCHES, MOVE_ACTION_PREFIXES))
+
+    def testAddToImport(self):
+        "Rev action 0 (add) -> 5 (import) in db.rev, db.revhx and db.revcx"
+        tail = '1 1420649505 1420649505 581AB2D89A05C623BDEF83 13 0 0 @//depot/inside/inside_file1@ @1.1@ 0 '
+        recs = ['@pv@ 9 @db.rev@ @//depot/inside/inside_file1@ 1 0 0 ' + tail,
+                '@pv@ 0 @db.revcx@ 1 @//depot/inside/inside_file1@ 1 0 ',
+                '@pv@ 9 @db.revhx@ @//depot/inside/inside_file1@ 1 0 0 ' + tail]
+        self.assertEqual(['@rv@ 9 @db.rev@ @//depot/inside/inside_file1@ 1 0 5 ' + tail,
+                          '@rv@ 0 @db.revcx@ 1 @//depot/inside/inside_file1@ 1 5 ',
+                          '@rv@ 9 @db.revhx@ @//depot/inside/inside_file1@ 1 0 5 ' + tail],
+                         patchJournalRecs(recs, [], ADD_TO_IMPORT_PREFIXES))
+
+    def testMoveCopyToBranch(self):
+        "Integed how 10 (edit into) -> 3 (branch into) and 4 (copy from) -> 2 (branch from)"
+        recs = ['@pv@ 1 @db.integed@ @//depot/inside/inside_file2@ @//depot/inside/inside_file3@ 0 1 0 1 10 3 ',
+                '@pv@ 1 @db.integed@ @//depot/inside/inside_file3@ @//depot/inside/inside_file2@ 0 1 0 1 4 3 ']
+        self.assertEqual(['@rv@ 1 @db.integed@ @//depot/inside/inside_file2@ @//depot/inside/inside_file3@ 0 1 0 1 3 3 ',
+                          '@rv@ 1 @db.integed@ @//depot/inside/inside_file3@ @//depot/inside/inside_file2@ 0 1 0 1 2 3 '],
+                         patchJournalRecs(recs, MOVE_COPY_TO_BRANCH_PATCHES))
+
+    def testRev3ToRev2(self):
+        "Rev 3 (a delete) becomes rev 2 at change 4 with lbrRev 1.4 - the existing rev 2 record is dropped"
+        recs = ['@pv@ 9 @db.rev@ @//depot/inside/inside_file2@ 3 0 2 5 1430226630 0 00000000000000000000000000000000 -1 0 0 '
+                '@//depot/inside/inside_file2@ @1.5@ 0 ',
+                '@pv@ 9 @db.rev@ @//depot/inside/inside_file2@ 2 0 1 4 1430226630 1430226630 8BFA8E0684108F419933A5995264D150 12 0 0 '
+                '@//depot/inside/inside_file2@ @1.4@ 0 ']
+        self.assertEqual(['@rv@ 9 @db.rev@ @//depot/inside/inside_file2@ 2 0 2 4 1430226630 0 00000000000000000000000000000000 -1 0 0 '
+                          '@//depot/inside/inside_file2@ @1.4@ 0 '],
+                         patchJournalRecs(recs, REV3_TO_REV2_PATCHES))
+
+    def testEditToInteg(self):
+        "Rev action 1 (edit) -> 4 (integ) in db.rev, db.revhx and db.revcx"
+        tail = '1423760150 1423760150 1141C16D0BA151F6054F1D8 28 0 0 @//depot/inside/inside_file2@ @1.4@ 0 '
+        recs = ['@pv@ 9 @db.rev@ @//depot/inside/inside_file2@ 2 0 1 4 ' + tail,
+                '@pv@ 9 @db.revhx@ @//depot/inside/inside_file2@ 2 0 1 4 ' + tail,
+                '@pv@ 0 @db.revcx@ 4 @//depot/inside/inside_file2@ 2 1 ',
+                '@pv@ 9 @db.rev@ @//depot/inside/inside_file1@ 2 0 1 4 ' + tail]
+        self.assertEqual(['@rv@ 9 @db.rev@ @//depot/inside/inside_file2@ 2 0 4 4 ' + tail,
+                          '@rv@ 9 @db.revhx@ @//depot/inside/inside_file2@ 2 0 4 4 ' + tail,
+                          '@rv@ 0 @db.revcx@ 4 @//depot/inside/inside_file2@ 2 4 '],
+                         patchJournalRecs(recs, [], EDIT_TO_INTEG_PREFIXES))
 
 
 if __name__ == '__main__':
     parser = argparse.ArgumentParser()
     parser.add_argument('--p4d', default=P4D)
+    parser.add_argument('--fast', action='store_true', default=FAST_TESTS,
+                        help="Skip sanity checks of source state before running P4Transfer")
+    parser.add_argument('--no-debug', action='store_true', default=NO_DEBUG_LOGGING,
+                        help="Log at INFO level, skipping p4 commands which only produce debug output")
+    parser.add_argument('--tmpfs', action='store_true', default=USE_TMPFS,
+                        help="Create test servers and workspaces under %s if it exists" % TMPFS_ROOT)
     parser.add_argument('unittest_args', nargs='*')
 
     args = parser.parse_args()
     if args.p4d != P4D:
         P4D = args.p4d
+    FAST_TESTS = args.fast
+    NO_DEBUG_LOGGING = args.no_debug
+    USE_TMPFS = args.tmpfs
 
     # Now set the sys.argv to the unittest_args (leaving sys.argv[0] alone)
     unit_argv = [sys.argv[0]] + args.unittest_args